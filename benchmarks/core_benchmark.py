@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Headless benchmark for the loaders, formatter and typing engine
+
+Generates synthetic CSV, CSV.gz and Parquet files of increasing size and
+width, then measures throughput and peak Python memory of the loading,
+sampling, formatting and typing-scheduler code paths without opening a
+window, using the shared screensaver_core package directly, and the memory
+of sampled rows in a ColumnarTable against lists of strings. Files are
+loaded through DatasetLoader.load_file like the screensaver does, and a
+large case exercises the mmap and gzip member index samplers.
+Results are printed as JSON.
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from pathlib import Path
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from screensaver_core import ColumnarTable, DatasetLoader, TableFormatter, TypingSpeedModel
+
+FRAME_MS = 1000 / 60  # Simulated display refresh interval
+GZIP_MEMBER_BYTES = 64 * 1024  # Uncompressed bytes per member of the large multi-member .csv.gz
+
+def synthetic_rows(num_rows, num_cols, seed=1234):
+    """Yield a header and num_rows rows of mixed-length text and numbers"""
+    rng = random.Random(seed)
+    words = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel"]
+    yield [f"column_{col}" for col in range(num_cols)]
+    for row_idx in range(num_rows):
+        yield [
+            str(row_idx) if col == 0 else
+            f"{rng.random() * 1000:.3f}" if col % 3 == 1 else
+            " ".join(rng.choice(words) for _ in range(rng.randint(1, 8)))
+            for col in range(num_cols)
+        ]
+
+def write_datasets(folder, num_rows, num_cols):
+    """Write the same synthetic table as CSV, CSV.gz and (if pyarrow is present) Parquet"""
+    base = os.path.join(folder, f"synthetic_{num_rows}x{num_cols}")
+    paths = {"csv": base + ".csv", "csv.gz": base + ".csv.gz"}
+    with open(paths["csv"], "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(synthetic_rows(num_rows, num_cols))
+    with gzip.open(paths["csv.gz"], "wt", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(synthetic_rows(num_rows, num_cols))
+    
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return paths
+    rows = synthetic_rows(num_rows, num_cols)
+    header = next(rows)
+    columns = list(zip(*rows)) or [()] * num_cols
+    table = pa.table({name: pa.array(values, pa.string()) for name, values in zip(header, columns)})
+    paths["parquet"] = base + ".parquet"
+    pq.write_table(table, paths["parquet"], row_group_size=64 * 1024)
+    return paths
+
+def write_large_datasets(folder, min_bytes, num_cols):
+    """Write a CSV and a multi-member (BGZF-like) .csv.gz of at least min_bytes; returns (paths, rows)"""
+    base = os.path.join(folder, f"synthetic_large_{num_cols}")
+    paths = {"csv": base + ".csv", "csv.gz": base + ".csv.gz"}
+    num_rows = 0
+    with open(paths["csv"], "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        rows = synthetic_rows(10 ** 9, num_cols)
+        writer.writerow(next(rows))
+        for row in rows:
+            writer.writerow(row)
+            num_rows += 1
+            if num_rows % 1000 == 0 and f.tell() >= min_bytes:
+                break
+    
+    # One gzip member per block of whole lines, like bgzip writes
+    with open(paths["csv"], "rb") as src, open(paths["csv.gz"], "wb") as dst:
+        while True:
+            block = src.read(GZIP_MEMBER_BYTES) + src.readline()
+            if not block:
+                break
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+            dst.write(compressor.compress(block) + compressor.flush())
+    return paths, num_rows
+
+def measure(func, repeat):
+    """Run func repeat times; return median seconds, peak traced memory and the last result"""
+    durations = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        durations.append(time.perf_counter() - start)
+    
+    # Memory comes from one more run, since tracing slows Python code down many times over
+    tracemalloc.start()
+    func()
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(durations), peak_bytes, result
+
+def list_rows_bytes(rows):
+    """Bytes held by rows stored as lists of Python strings, the layout ColumnarTable replaces"""
+    return sys.getsizeof(rows) + sum(
+        sys.getsizeof(row) + sum(sys.getsizeof(cell) for cell in row) for row in rows
+    )
+
+def simulate_typing(text):
+    """Run the frame-clock typing scheduler over text; returns (frames, simulated seconds)"""
+    model = TypingSpeedModel()
+    char_index = 0
+    frames = 0
+    while char_index < len(text):
+        count = model.chars_due(FRAME_MS, len(text) - char_index)
+        chunk = text[char_index:char_index + count]
+        char_index += len(chunk)
+        frames += 1
+    return frames, frames * FRAME_MS / 1000
+
+def run_case(loader, paths, num_rows, num_cols, repeat, large=False):
+    """All benchmarks for one dataset size, as a list of result records
+    
+    The large case only loads its files, which go through the samplers for big files.
+    """
+    results = []
+    
+    def add(name, func, rows=num_rows):
+        seconds, peak_bytes, result = measure(func, repeat)
+        results.append({
+            "benchmark": name,
+            "rows": num_rows,
+            "columns": num_cols,
+            "seconds": seconds,
+            "rows_per_second": rows / seconds if seconds else None,
+            "peak_python_bytes": peak_bytes,
+        })
+        return result
+    
+    # The screensaver's entry point: format registry, then the format's sampler
+    if large:
+        add("load_file_csv_mmap", lambda: loader.load_file(Path(paths["csv"])))
+        add("load_file_csv_gz_indexed", lambda: loader.load_file(Path(paths["csv.gz"])))
+        return results
+    
+    dataset = add("load_file_csv", lambda: loader.load_file(Path(paths["csv"])))
+    add("load_file_csv_gz", lambda: loader.load_file(Path(paths["csv.gz"])))
+    if "parquet" in paths:
+        add("load_file_parquet", lambda: loader.load_file(Path(paths["parquet"])))
+    
+    full_dataset = list(synthetic_rows(num_rows, num_cols))
+    add("limit_dataset_rows", lambda: loader.limit_dataset_rows(full_dataset))
+    
+    # Memory of all rows as a sampled table and as the lists of strings it replaces
+    results.append({
+        "benchmark": "sample_storage",
+        "rows": num_rows,
+        "columns": num_cols,
+        "table_bytes": ColumnarTable.from_rows(full_dataset, loader.MAX_CELL_CHARS).nbytes(),
+        "list_bytes": list_rows_bytes(full_dataset[1:]),
+    })
+    
+    def format_all():
+        return "\n".join(TableFormatter().prepare_display_text(dataset)) + "\n"
+    
+    text = add("prepare_display_text", format_all, rows=len(dataset) - 1)
+    
+    frames, simulated_seconds = add(
+        "typing_scheduler", lambda: simulate_typing(text), rows=len(dataset) - 1
+    )
+    results[-1]["characters"] = len(text)
+    results[-1]["frames"] = frames
+    results[-1]["simulated_seconds"] = simulated_seconds
+    return results
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="data row counts to generate")
+    parser.add_argument("--columns", type=int, nargs="+", default=[5, 40],
+                        help="column counts to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark (median is kept)")
+    parser.add_argument("--large-mb", type=int,
+                        default=DatasetLoader.MMAP_MIN_BYTES // (1024 * 1024) + 16,
+                        help="size of the large CSV case, above the mmap and gzip index "
+                             "thresholds (0 skips it)")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+    
+    loader = DatasetLoader()
+    results = []
+    with tempfile.TemporaryDirectory(prefix="csv-screensaver-bench-") as folder:
+        for num_cols in args.columns:
+            for num_rows in args.rows:
+                paths = write_datasets(folder, num_rows, num_cols)
+                results.extend(run_case(loader, paths, num_rows, num_cols, args.repeat))
+                for path in paths.values():
+                    os.remove(path)
+                print(f"done: {num_rows} rows x {num_cols} columns", file=sys.stderr)
+        
+        if args.large_mb > 0:
+            num_cols = min(args.columns)
+            paths, num_rows = write_large_datasets(folder, args.large_mb * 1024 * 1024, num_cols)
+            results.extend(run_case(loader, paths, num_rows, num_cols, args.repeat, large=True))
+            print(f"done: large {num_rows} rows x {num_cols} columns", file=sys.stderr)
+    
+    report = {
+        "python": sys.version.split()[0],
+        "max_display_rows": loader.max_rows,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the CSV Retro Screensaver
+
+Measures module import time, time-to-first-frame and peak RSS of a fresh
+screensaver process, so startup cost can be tracked across releases.
+Each run happens in a new Python process; results are printed as JSON.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCREENSAVER_PATH = os.path.join(REPO_ROOT, "csv-screensaver.py")
+
+# Runs inside the child process; prints one JSON object on its last line
+CHILD_SCRIPT = r'''
+import importlib.util
+import json
+import resource
+import sys
+import time
+
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location("csv_screensaver", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+result = {"import_ms": (time.perf_counter() - start) * 1000}
+
+if sys.argv[3] == "1":
+    from gi.repository import GLib, Gtk
+    
+    def on_first_draw(widget, cr):
+        if "first_frame_ms" not in result:
+            result["first_frame_ms"] = (time.perf_counter() - start) * 1000
+            GLib.idle_add(Gtk.main_quit)
+        return False
+    
+    session = module.ScreensaverSession(sys.argv[2] or None)
+    session.windows[0].connect_after("draw", on_first_draw)
+    session.show_all()
+    GLib.timeout_add_seconds(30, Gtk.main_quit)  # Don't hang without a compositor
+    Gtk.main()
+
+# ru_maxrss is in kilobytes on Linux
+result["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+result["modules"] = sorted(name for name in ("pandas", "pyarrow") if name in sys.modules)
+print(json.dumps(result))
+'''
+
+def run_once(data_folder, first_frame):
+    """Start one screensaver process and return its measurements"""
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, SCREENSAVER_PATH,
+         data_folder or "", "1" if first_frame else "0"],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def summarize(samples):
+    """Median/min/max for each numeric metric"""
+    summary = {}
+    for key in ("import_ms", "first_frame_ms", "peak_rss_kb"):
+        values = [sample[key] for sample in samples if key in sample]
+        if values:
+            summary[key] = {
+                "median": statistics.median(values),
+                "min": min(values),
+                "max": max(values),
+            }
+    summary["modules_loaded"] = samples[-1]["modules"] if samples else []
+    return summary
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("data_folder", nargs="?", help="data folder passed to the screensaver")
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh processes to start")
+    parser.add_argument("--no-window", action="store_true",
+                        help="only measure imports (no display required)")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+    
+    first_frame = not args.no_window and bool(
+        os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")
+    )
+    samples = [run_once(args.data_folder, first_frame) for _ in range(args.runs)]
+    report = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "first_frame_measured": first_frame,
+        "summary": summarize(samples),
+        "samples": samples,
+    }
+    
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -6,55 +6,373 @@ in retro command-line style with typing effects
 
 import gi
 gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk, Gdk, GLib, Pango
-import csv
-import gzip
+from gi.repository import Gtk, Gdk, Gio, GLib, Pango
+import argparse
+import math
 import os
-import random
+import queue
 import sys
-from pathlib import Path
-from contextlib import closing
-import pandas as pd
-import pyarrow.parquet as pq
+import threading
+from itertools import islice
+
+# The shared core package sits next to this script, or in /usr/lib/csv-screensaver once installed
+for _lib_dir in (os.path.dirname(os.path.realpath(__file__)), "/usr/lib/csv-screensaver"):
+    if os.path.isdir(os.path.join(_lib_dir, "screensaver_core")):
+        sys.path.insert(0, _lib_dir)
+        break
+
+from screensaver_core import DataSource, DatasetSelection, PerfStats, SharedTextFeed, TypingSpeedModel
+
+class FrameScheduler:
+    """One frame clock callback driving the animations of every screensaver window
+    
+    Can be suspended (no wakeups at all) or throttled to a low fixed rate
+    timer; time spent suspended is skipped, so animations resume where they
+    stopped instead of jumping ahead.
+    """
+    
+    THROTTLED_FPS = 15  # Frame rate while throttled, e.g. on battery
+    
+    def __init__(self):
+        self.widget = None  # Widget whose frame clock paces all callbacks
+        self.tick_id = None
+        self.timer_id = None  # Fixed rate timer used instead of the frame clock while throttled
+        self.frame_interval_ms = 1000 / 60  # Display refresh interval, updated from the frame clock
+        self.callbacks = {}  # Handle -> callback(frame_time_ms), kept while it returns True
+        self.next_handle = 1
+        self.suspended = False
+        self.throttled = False
+        self.skipped_ms = 0.0  # Suspended time hidden from the callbacks
+        self.last_real_time = None
+        self.resuming = False
+    
+    def attach(self, widget):
+        """Use widget's frame clock; the other windows redraw whenever their buffers change
+        
+        Moves a running tick over, since a hidden window's frame clock stops.
+        """
+        if widget is self.widget:
+            return
+        self.stop()
+        self.widget = widget
+        self.start()
+    
+    def add(self, callback):
+        """Call callback(frame_time_ms) every frame until it returns False; returns a handle"""
+        handle = self.next_handle
+        self.next_handle += 1
+        self.callbacks[handle] = callback
+        self.start()
+        return handle
+    
+    def remove(self, handle):
+        """Stop calling a callback"""
+        self.callbacks.pop(handle, None)
+    
+    def set_mode(self, suspended, throttled):
+        """Switch between frame clock, throttled timer and no wakeups at all"""
+        if (suspended, throttled) == (self.suspended, self.throttled):
+            return
+        self.stop()
+        if self.suspended and not suspended:
+            self.resuming = True
+        self.suspended = suspended
+        self.throttled = throttled
+        self.start()
+    
+    def start(self):
+        """Start the frame source for the current mode if callbacks are waiting"""
+        if self.suspended or not self.callbacks or self.tick_id or self.timer_id:
+            return
+        if self.throttled:
+            self.frame_interval_ms = 1000 / self.THROTTLED_FPS
+            self.timer_id = GLib.timeout_add(int(self.frame_interval_ms), self.on_timer)
+        else:
+            self.tick_id = self.widget.add_tick_callback(self.on_tick)
+    
+    def stop(self):
+        """Remove the frame source"""
+        if self.tick_id:
+            self.widget.remove_tick_callback(self.tick_id)
+            self.tick_id = None
+        if self.timer_id:
+            GLib.source_remove(self.timer_id)
+            self.timer_id = None
+    
+    def on_tick(self, widget, frame_clock):
+        """Frame clock callback, stopping the tick once no callbacks are left"""
+        frame_time_us = frame_clock.get_frame_time()
+        refresh_interval_us, _ = frame_clock.get_refresh_info(frame_time_us)
+        if refresh_interval_us > 0:
+            self.frame_interval_ms = refresh_interval_us / 1000.0
+        
+        if self.run_callbacks(frame_time_us / 1000.0):  # microseconds -> ms
+            return True
+        self.tick_id = None
+        return False
+    
+    def on_timer(self):
+        """Throttled timer callback; the monotonic clock is the one frame clocks use"""
+        if self.run_callbacks(GLib.get_monotonic_time() / 1000.0):
+            return True
+        self.timer_id = None
+        return False
+    
+    def run_callbacks(self, real_time):
+        """Run every registered callback for this frame, returning True while any are left"""
+        # After a suspend, continue as if only one frame had passed
+        if self.resuming and self.last_real_time is not None:
+            self.skipped_ms += max(0.0, real_time - self.last_real_time - self.frame_interval_ms)
+        self.resuming = False
+        self.last_real_time = real_time
+        
+        frame_time = real_time - self.skipped_ms
+        for handle, callback in list(self.callbacks.items()):
+            if handle in self.callbacks and not callback(frame_time):
+                self.callbacks.pop(handle, None)
+        return bool(self.callbacks)
+
+class PowerMonitor:
+    """Follows display power (GNOME Mutter) and battery (UPower) state over D-Bus
+    
+    Services that are not running are ignored, leaving the state as "display
+    on, mains power".
+    """
+    
+    DISPLAY_POWER_ON = 0  # Mutter PowerSaveMode: 0 on, 1 standby, 2 suspend, 3 off, -1 unknown
+    
+    def __init__(self, on_change):
+        self.on_change = on_change  # Called with no arguments whenever a state flips
+        self.display_off = False
+        self.on_battery = False
+        self.proxies = []  # Kept alive so their property signals keep arriving
+        self.watch(Gio.BusType.SYSTEM, "org.freedesktop.UPower", "/org/freedesktop/UPower",
+                   "org.freedesktop.UPower", "OnBattery", self.set_on_battery)
+        self.watch(Gio.BusType.SESSION, "org.gnome.Mutter.DisplayConfig",
+                   "/org/gnome/Mutter/DisplayConfig", "org.gnome.Mutter.DisplayConfig",
+                   "PowerSaveMode", self.set_power_save_mode)
+    
+    def watch(self, bus_type, name, path, interface, prop, setter):
+        """Call setter with a D-Bus property now and whenever it changes"""
+        def on_proxy_ready(source, result):
+            try:
+                proxy = Gio.DBusProxy.new_for_bus_finish(result)
+            except GLib.Error:
+                return
+            self.proxies.append(proxy)
+            
+            def update(*args):
+                value = proxy.get_cached_property(prop)
+                if value is not None:
+                    setter(value.unpack())
+            
+            proxy.connect("g-properties-changed", update)
+            update()
+        
+        Gio.DBusProxy.new_for_bus(bus_type, Gio.DBusProxyFlags.NONE, None,
+                                  name, path, interface, None, on_proxy_ready)
+    
+    def set_on_battery(self, on_battery):
+        """UPower OnBattery changed"""
+        if bool(on_battery) != self.on_battery:
+            self.on_battery = bool(on_battery)
+            self.on_change()
+    
+    def set_power_save_mode(self, mode):
+        """Mutter PowerSaveMode changed (DPMS)"""
+        # -1 means the mode is unknown or unsupported, so only 1-3 count as off
+        display_off = mode > self.DISPLAY_POWER_ON
+        if display_off != self.display_off:
+            self.display_off = display_off
+            self.on_change()
+
+class ScreensaverSession:
+    """Loads and formats each dataset once and shows it in one window per monitor"""
+    
+    LOADER_CHUNK_LINES = 500  # Lines handed from the loader thread per chunk
+    LOADER_QUEUE_CHUNKS = 4  # Chunks the loader may format ahead of the slowest window
+    PLAYLIST_MODES = DataSource.PLAYLIST_MODES
+    PLAYLIST_HOLD_SECONDS = 30  # Panning time before switching to the next dataset
+    
+    def __init__(self, csv_folder=None, playlist_mode=None, show_hud=False, collect_stats=False,
+                 workers=1, selection=None, all_monitors=False, power_aware=True):
+        self.data_source = DataSource(csv_folder, workers=workers, selection=selection)
+        self.playlist_mode = playlist_mode  # None, "random", "shuffle" or "weighted"
+        self.show_hud = show_hud
+        self.perf = PerfStats(enabled=show_hud or collect_stats)
+        self.scheduler = FrameScheduler()
+        self.loader_thread = None
+        self.next_feed = None  # Prefetched dataset in playlist mode
+        self.playlist_timer_id = None
+        self.windows_typing = 0  # Windows that have not finished typing the current dataset
+        self.hidden_windows = set()  # Windows that are minimized, withdrawn or fully covered
+        self.playlist_paused = False  # Hold timer removed while nothing is visible
+        
+        # One fullscreen window per monitor, or a single one on the current monitor
+        monitors = [None]
+        if all_monitors:
+            monitors = list(range(Gdk.Display.get_default().get_n_monitors())) or [None]
+        self.windows = [RetroScreensaver(self, monitor) for monitor in monitors]
+        self.scheduler.attach(self.windows[0].text_view)  # Moved to a visible window as needed
+        self.power = PowerMonitor(self.update_power_state) if power_aware else None
+        
+        self.start_dataset(self.start_loading())
+        if self.playlist_mode:
+            # Prefetch the next dataset while the first one is typing
+            self.next_feed = self.start_loading()
+    
+    def show_all(self):
+        """Show every window"""
+        for window in self.windows:
+            window.show_all()
+    
+    def set_window_visible(self, window, visible):
+        """Track which windows can be seen, suspending the animations once none can"""
+        if visible:
+            self.hidden_windows.discard(window)
+        else:
+            self.hidden_windows.add(window)
+        self.update_power_state()
+    
+    def update_power_state(self):
+        """Suspend everything when nothing is visible, throttle on battery, else run at full rate"""
+        display_off = self.power is not None and self.power.display_off
+        on_battery = self.power is not None and self.power.on_battery
+        suspended = display_off or len(self.hidden_windows) >= len(self.windows)
+        
+        # Follow the frame clock of a window that is still drawn
+        visible = [window for window in self.windows if window not in self.hidden_windows]
+        if visible and self.scheduler.widget not in [window.text_view for window in visible]:
+            self.scheduler.attach(visible[0].text_view)
+        self.scheduler.set_mode(suspended, on_battery)
+        
+        # Don't load new datasets for nobody; restart the hold once visible again
+        if suspended and self.playlist_timer_id:
+            GLib.source_remove(self.playlist_timer_id)
+            self.playlist_timer_id = None
+            self.playlist_paused = True
+        elif not suspended and self.playlist_paused:
+            self.playlist_paused = False
+            self.playlist_timer_id = GLib.timeout_add_seconds(
+                self.PLAYLIST_HOLD_SECONDS, self.next_dataset
+            )
+    
+    def start_loading(self):
+        """Load and format a dataset on a worker thread, returning the feed it fills"""
+        feed = SharedTextFeed(len(self.windows), self.LOADER_QUEUE_CHUNKS)
+        self.loader_thread = threading.Thread(
+            target=self.load_in_background, args=(feed,), daemon=True
+        )
+        self.loader_thread.start()
+        return feed
+    
+    def load_in_background(self, feed):
+        """Worker thread body: hand formatted lines to the typing engines in chunks
+        
+        The feed is bounded, so formatting only runs a few chunks ahead of
+        the slowest window and the rendered document never exists as one string.
+        """
+        try:
+            # Loads take turns inside the data source; formatting below runs lazily
+            with self.perf.timed("load"):
+                lines = iter(self.data_source.load_lines(self.playlist_mode or "random"))
+            while True:
+                with self.perf.timed("format_chunk"):
+                    chunk = list(islice(lines, self.LOADER_CHUNK_LINES))
+                    text = "\n".join(chunk) + "\n"
+                if not chunk:
+                    break
+                feed.put(text)
+        finally:
+            # Even after an error the windows must see the end of the text, or they wait forever
+            feed.put("\n".join(self.data_source.formatter.footer_lines()))
+            feed.put(None)  # End of text
+    
+    def start_dataset(self, feed):
+        """Start every window typing the dataset arriving on feed"""
+        self.windows_typing = len(self.windows)
+        for idx, window in enumerate(self.windows):
+            window.start_typing(feed.reader(idx))
+    
+    def window_finished_typing(self):
+        """Called by each window once it has typed everything"""
+        self.windows_typing -= 1
+        
+        # In playlist mode, move on to the prefetched dataset after a while
+        if self.windows_typing == 0 and self.playlist_mode:
+            if self.scheduler.suspended:
+                self.playlist_paused = True
+                return
+            self.playlist_timer_id = GLib.timeout_add_seconds(
+                self.PLAYLIST_HOLD_SECONDS, self.next_dataset
+            )
+    
+    def next_dataset(self):
+        """Switch to the prefetched dataset and start prefetching the one after it"""
+        self.playlist_timer_id = None
+        for window in self.windows:
+            window.stop_panning()
+        
+        feed = self.next_feed
+        self.next_feed = self.start_loading()
+        self.start_dataset(feed)
+        return False
 
 class RetroScreensaver(Gtk.Window):
-    """Main screensaver window with retro terminal aesthetic"""
+    """Screensaver window with retro terminal aesthetic, one per monitor"""
     
-    MAX_DISPLAY_ROWS = 10000
+    CURSOR_GLYPH = "█"
+    CURSOR_COLOR = "#00FF00"
+    BACKGROUND_COLOR = "#000000"
+    BUFFER_SCREENS = 3  # Screenfuls of typed lines kept in the text buffer
+    BUFFER_TRIM_LINES = 100  # Lines allowed past the limit before trimming
+    DEFAULT_SCREEN_LINES = 60
     
-    def __init__(self, csv_folder=None):
+    def __init__(self, session, monitor=None):
         super().__init__(title="CSV Retro Screensaver")
         
         # Configuration
-        self.csv_folder = csv_folder or os.path.expanduser("~/.local/share/csv-screensaver/data")
+        self.session = session  # Shared data source, scheduler and stats
+        self.monitor = monitor  # Monitor number to go fullscreen on, None for the current one
+        self.data_source = session.data_source
+        self.csv_folder = self.data_source.data_folder
         self.current_text = ""
-        self.display_text = ""
         self.char_index = 0
-        self.typing_delay = 150  # Start with slow typing (milliseconds)
-        self.min_typing_delay = 20  # End with fast typing
-        self.delay_decrease_rate = 0.98  # How fast the typing accelerates
-        self.timer_id = None
-        self.current_dataset = []
-        self.current_row = 0
+        self.typing_model = TypingSpeedModel()  # Typing delays and acceleration
+        self.typing_tick = None  # Scheduler handle of the typing animation
+        self.pan_tick = None  # Scheduler handle of the panning animation
+        self.last_frame_time = None
         self.blink_state = True
         self.chars_typed = 0
-        self.pan_offset = 0  # Horizontal panning offset
+        self.pan_offset = 0.0  # Horizontal panning offset, sub-pixel
         self.pan_direction = 1  # 1 for right, -1 for left
-        self.pan_speed = 2  # Pixels to pan per update
+        self.pan_speed = 60  # Pixels per second away from the edges
+        self.typing_mark = None  # Insertion point for newly typed text
+        self.cursor_tag = None
+        self.loading_done = False  # Set once the worker has delivered all text
+        self.text_queue = queue.Queue()  # Formatted text chunks from the loader
+        self.show_hud = session.show_hud
+        self.hud_label = None
+        self.perf = session.perf
+        self.last_pan_time = None
+        self.pan_start_time = None
         
         # Panning animation constants
-        self.PANNING_FRAME_INTERVAL_MS = 33  # ~30 FPS for smooth animation
-        self.CURSOR_BLINK_FRAMES = 15  # Blink cursor every ~500ms at 30 FPS
+        self.PAN_EASE_PX = 40  # Distance from each edge over which the pan slows down
+        self.PAN_MIN_SPEED = 0.15  # Fraction of pan_speed kept right at the edges
+        self.PAN_MAX_STEP_MS = 100  # Longest frame gap applied at once, so late frames never jump
+        self.CURSOR_BLINK_MS = 500  # Cursor blink half-period while panning
         
         # Setup window
         self.setup_window()
         self.setup_ui()
-        self.load_csv_data()
-        self.start_typing()
-        
+    
     def setup_window(self):
         """Configure the window to be fullscreen and handle events"""
-        self.fullscreen()
+        if self.monitor is None:
+            self.fullscreen()
+        else:
+            self.fullscreen_on_monitor(self.get_screen(), self.monitor)
         self.set_decorated(False)
         
         # Make it exit on any key press or mouse click
@@ -62,11 +380,18 @@ class RetroScreensaver(Gtk.Window):
         self.connect("button-press-event", self.on_button_press)
         self.connect("destroy", Gtk.main_quit)
         
+        # Stop animating while the window cannot be seen
+        self.add_events(Gdk.EventMask.VISIBILITY_NOTIFY_MASK)
+        self.connect("window-state-event", self.on_window_state)
+        self.connect("visibility-notify-event", self.on_visibility)
+        self.connect("map-event", self.on_map_changed, True)
+        self.connect("unmap-event", self.on_map_changed, False)
+        
         # Set cursor invisible
         blank_cursor = Gdk.Cursor.new_from_name(Gdk.Display.get_default(), "none")
         if blank_cursor:
             self.get_window().set_cursor(blank_cursor) if self.get_window() else None
-        
+    
     def setup_ui(self):
         """Create the retro terminal-style UI"""
         # Create main container
@@ -97,11 +422,28 @@ class RetroScreensaver(Gtk.Window):
         # Add widgets
         scrolled.add(self.text_view)
         box.pack_start(scrolled, True, True, 0)
-        self.add(box)
+        
+        # Overlay so the performance HUD can sit on top of the text
+        overlay = Gtk.Overlay()
+        overlay.add(box)
+        if self.show_hud:
+            self.hud_label = Gtk.Label()
+            self.hud_label.set_halign(Gtk.Align.END)
+            self.hud_label.set_valign(Gtk.Align.START)
+            self.hud_label.set_margin_top(4)
+            self.hud_label.set_margin_end(8)
+            overlay.add_overlay(self.hud_label)
+            GLib.timeout_add_seconds(1, self.update_hud)
+        self.add(overlay)
         
         # Store scrolled window for panning
         self.scrolled_window = scrolled
-        
+    
+    def update_hud(self):
+        """Refresh the performance overlay once per second"""
+        self.hud_label.set_text(self.perf.summary_line())
+        return True
+    
     def apply_retro_style(self):
         """Apply retro terminal color scheme and monospace font"""
         css_provider = Gtk.CssProvider()
@@ -133,7 +475,7 @@ class RetroScreensaver(Gtk.Window):
         
         # Also set font via tags
         self.create_text_tags()
-        
+    
     def create_text_tags(self):
         """Create text formatting tags"""
         tag_table = self.text_buffer.get_tag_table()
@@ -151,337 +493,252 @@ class RetroScreensaver(Gtk.Window):
         header_tag.set_property("weight", Pango.Weight.BOLD)
         tag_table.add(header_tag)
         
-        # Cursor tag (for blinking cursor effect)
+        # Cursor tag (for blinking cursor effect); blinking only recolors
+        # the tagged glyph, which is a redraw rather than a re-layout
         cursor_tag = Gtk.TextTag.new("cursor")
-        cursor_tag.set_property("background", "#00FF00")
-        cursor_tag.set_property("foreground", "#000000")
+        cursor_tag.set_property("foreground", self.CURSOR_COLOR)
         tag_table.add(cursor_tag)
+        self.cursor_tag = cursor_tag
     
-    def limit_dataset_rows(self, dataset, max_rows=None):
-        """Limit dataset to header + max_rows randomly selected data rows"""
-        max_rows = self.MAX_DISPLAY_ROWS if max_rows is None else max_rows
-        if len(dataset) > 1:
-            header = [dataset[0]]
-            data_rows = dataset[1:]
-            data_rows = self.sample_rows(data_rows, max_rows)
-            return header + data_rows
-        return dataset
-    
-    def sample_rows(self, rows, max_rows=None):
-        """Return up to max_rows sampled rows"""
-        max_rows = self.MAX_DISPLAY_ROWS if max_rows is None else max_rows
-        if max_rows <= 0:
-            return []
-        if len(rows) > max_rows:
-            return random.sample(rows, max_rows)
-        return rows
-    
-    def load_parquet_in_chunks(self, data_file, max_rows=None, batch_size=1000):
-        """Load parquet data without reading the entire file into memory"""
-        max_rows = self.MAX_DISPLAY_ROWS if max_rows is None else max_rows
-        
+    def next_text_chunk(self):
+        """Switch to the next chunk from the loader, returning False if none is ready"""
+        if self.loading_done:
+            return False
         try:
-            with closing(pq.ParquetFile(data_file)) as parquet_file:
-                columns = parquet_file.schema.names
-                
-                if max_rows <= 0:
-                    return [columns]
-                
-                # Start with header row and reservoir for sampled data
-                sampled_rows = []
-                total_rows_seen = 0
-                column_index = {name: idx for idx, name in enumerate(columns)}
-                
-                for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
-                    batch_columns = [
-                        batch.column(column_index[name]) if name in column_index and column_index[name] < batch.num_columns else None
-                        for name in columns
-                    ]
-                    rows_iter = (
-                        tuple(
-                            col[row_idx].as_py() if col is not None else None
-                            for col in batch_columns
-                        )
-                        for row_idx in range(batch.num_rows)
-                    )
-                    
-                    for row in rows_iter:
-                        total_rows_seen += 1
-                        if len(sampled_rows) < max_rows:
-                            sampled_rows.append(row)
-                        else:
-                            # Reservoir sampling: uniform replacement in existing sample
-                            swap_index = random.randint(0, total_rows_seen - 1)
-                            if swap_index < max_rows:
-                                sampled_rows[swap_index] = row
-        except Exception as e:
-            raise RuntimeError(f"Failed to stream parquet file {data_file}: {e}") from e
-        
-        return [columns] + sampled_rows
-        
-    def load_csv_data(self):
-        """Load CSV files (including gzipped) and Parquet files from the specified folder"""
-        if not os.path.exists(self.csv_folder):
-            # Create folder and add sample data
-            os.makedirs(self.csv_folder, exist_ok=True)
-            self.create_sample_csv()
-        
-        # Find CSV, gzipped CSV, and Parquet files
-        csv_files = list(Path(self.csv_folder).glob("*.csv"))
-        csv_gz_files = list(Path(self.csv_folder).glob("*.csv.gz"))
-        parquet_files = list(Path(self.csv_folder).glob("*.parquet"))
-        
-        all_files = csv_files + csv_gz_files + parquet_files
-        
-        if not all_files:
-            self.current_text = "No CSV or Parquet files found in: " + self.csv_folder
-            return
+            chunk = self.text_queue.get_nowait()
+        except queue.Empty:
+            return False
+        if chunk is None:
+            self.loading_done = True
+            return False
+        self.current_text = chunk
+        self.char_index = 0
+        return True
+    
+    def start_typing(self, text_queue):
+        """Start the typing animation with the banner, data follows as it arrives on text_queue"""
+        self.text_queue = text_queue
+        self.loading_done = False
+        self.current_text = "\n".join(self.data_source.formatter.banner_lines()) + "\n"
+        self.char_index = 0
+        self.typing_model.reset()  # Reset to slow speed
+        self.chars_typed = 0
+        self.reset_text_buffer()
+        self.schedule_next_char()
+    
+    def reset_text_buffer(self):
+        """Clear the buffer and place the cursor glyph with its typing mark"""
+        self.text_buffer.set_text("")
         
-        # Pick a random file
-        data_file = random.choice(all_files)
+        # The cursor is a single tagged glyph that always stays at the end
+        self.text_buffer.insert_with_tags_by_name(
+            self.text_buffer.get_start_iter(), self.CURSOR_GLYPH, "cursor"
+        )
         
-        try:
-            # Load data based on file type (case-insensitive)
-            file_name_lower = data_file.name.lower()
-            if file_name_lower.endswith('.parquet'):
-                # Load Parquet file in batches to avoid reading entire file into memory
-                self.current_dataset = self.load_parquet_in_chunks(data_file)
-            elif file_name_lower.endswith('.csv.gz'):
-                # Load gzipped CSV file
-                with gzip.open(data_file, 'rt', newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    self.current_dataset = list(reader)
-                # Limit to header + 10,000 randomly selected rows
-                self.current_dataset = self.limit_dataset_rows(self.current_dataset)
-            else:
-                # Load regular CSV file
-                with open(data_file, 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    self.current_dataset = list(reader)
-                # Limit to header + 10,000 randomly selected rows
-                self.current_dataset = self.limit_dataset_rows(self.current_dataset)
-            
-            if self.current_dataset:
-                self.prepare_display_text()
-            else:
-                self.current_text = f"Empty file: {data_file.name}"
-        except Exception as e:
-            self.current_text = f"Error loading file: {str(e)}"
-    
-    def prepare_display_text(self):
-        """Format CSV data for retro display"""
-        if not self.current_dataset:
+        # Right-gravity mark just before the cursor glyph; text inserted at
+        # the mark pushes it forward, so it never has to be recomputed
+        start_iter = self.text_buffer.get_start_iter()
+        if self.typing_mark is None:
+            self.typing_mark = self.text_buffer.create_mark("typing", start_iter, False)
+        else:
+            self.text_buffer.move_mark(self.typing_mark, start_iter)
+        self.set_cursor_shown(True)
+    
+    def append_typed_text(self, text):
+        """Insert typed text in front of the cursor without touching the rest of the buffer"""
+        with self.perf.timed("buffer_insert"):
+            typing_iter = self.text_buffer.get_iter_at_mark(self.typing_mark)
+            self.text_buffer.insert(typing_iter, text)
+        if '\n' in text:
+            self.trim_text_buffer()
+    
+    def buffer_line_limit(self):
+        """Number of lines to keep: BUFFER_SCREENS screenfuls of the visible area"""
+        visible_height = self.text_view.get_visible_rect().height
+        _, line_height = self.text_view.get_line_yrange(self.text_buffer.get_start_iter())
+        if visible_height <= 0 or line_height <= 0:
+            # Not laid out yet, assume a typical fullscreen terminal
+            lines_per_screen = self.DEFAULT_SCREEN_LINES
+        else:
+            lines_per_screen = max(1, visible_height // line_height)
+        return self.BUFFER_SCREENS * lines_per_screen
+    
+    def trim_text_buffer(self):
+        """Drop lines that scrolled off the top so buffer size and layout cost stay flat"""
+        line_count = self.text_buffer.get_line_count()
+        limit = self.buffer_line_limit()
+        
+        # Trim in batches so the deletion cost is amortized over many lines
+        if line_count <= limit + self.BUFFER_TRIM_LINES:
             return
         
-        lines = []
-        
-        # Add retro header
-        lines.append("=" * 70)
-        lines.append("  DATA RETRIEVAL SYSTEM v1.0")
-        lines.append("  [ CLASSIFIED INFORMATION ]")
-        lines.append("=" * 70)
-        lines.append("")
-        lines.append("Initializing data stream...")
-        lines.append("")
-        
-        # Determine column widths (capped at 30 characters)
-        MAX_COL_WIDTH = 30
-        col_widths = []
-        if self.current_dataset:
-            num_cols = len(self.current_dataset[0])
-            for col_idx in range(num_cols):
-                max_width = max(
-                    (len(str(row[col_idx])) if col_idx < len(row) else 0)
-                    for row in self.current_dataset
-                )
-                # Cap width at MAX_COL_WIDTH
-                col_widths.append(min(max_width, MAX_COL_WIDTH))
-        
-        # Format headers if first row looks like headers
-        if self.current_dataset:
-            header_row = self.current_dataset[0]
-            header_line = " | ".join(
-                self._truncate_cell(str(cell), col_widths[i])
-                for i, cell in enumerate(header_row) if i < len(col_widths)
-            )
-            lines.append(header_line)
-            lines.append("-" * len(header_line))
-            
-            # Add data rows
-            for row in self.current_dataset[1:]:
-                if row:  # Skip empty rows
-                    data_line = " | ".join(
-                        self._truncate_cell(str(cell), col_widths[i])
-                        for i, cell in enumerate(row) if i < len(col_widths)
-                    )
-                    lines.append(data_line)
-        
-        lines.append("")
-        lines.append("=" * 70)
-        lines.append("END OF DATA STREAM")
-        lines.append("=" * 70)
-        
-        self.current_text = "\n".join(lines)
-    
-    def _truncate_cell(self, cell_text, max_width):
-        """Truncate cell content to max_width, adding ellipsis if needed"""
-        if len(cell_text) > max_width:
-            # Reserve 3 characters for ellipsis
-            if max_width >= 3:
-                return cell_text[:max_width - 3] + "..."
-            else:
-                return cell_text[:max_width]
-        else:
-            return cell_text.ljust(max_width)
-    
-    def create_sample_csv(self):
-        """Create sample CSV files for demonstration"""
-        # Sample 1: Classic data
-        sample1_path = os.path.join(self.csv_folder, "retro_computers.csv")
-        with open(sample1_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(["Computer", "Year", "CPU", "RAM"])
-            writer.writerow(["Commodore 64", "1982", "MOS 6510", "64 KB"])
-            writer.writerow(["Apple II", "1977", "MOS 6502", "4 KB"])
-            writer.writerow(["IBM PC", "1981", "Intel 8088", "16 KB"])
-            writer.writerow(["Atari 800", "1979", "MOS 6502", "8 KB"])
-            writer.writerow(["ZX Spectrum", "1982", "Zilog Z80", "16 KB"])
-            writer.writerow(["Amiga 500", "1987", "Motorola 68000", "512 KB"])
-        
-        # Sample 2: Fun facts
-        sample2_path = os.path.join(self.csv_folder, "fun_facts.csv")
-        with open(sample2_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(["Fact ID", "Category", "Fact"])
-            writer.writerow(["001", "Space", "A day on Venus is longer than its year"])
-            writer.writerow(["002", "Ocean", "More people have been to space than the Mariana Trench"])
-            writer.writerow(["003", "Nature", "Honey never spoils - it can last thousands of years"])
-            writer.writerow(["004", "Tech", "The first computer bug was an actual moth"])
-            writer.writerow(["005", "History", "Oxford University predates the Aztec Empire"])
-    
-    def start_typing(self):
-        """Start the typing animation"""
-        self.char_index = 0
-        self.display_text = ""
-        self.typing_delay = 150  # Reset to slow speed
-        self.chars_typed = 0
-        self.schedule_next_char()
+        start_iter = self.text_buffer.get_start_iter()
+        end_iter = self.text_buffer.get_iter_at_line(line_count - limit)
+        self.text_buffer.delete(start_iter, end_iter)
     
     def schedule_next_char(self):
-        """Schedule the next character to be typed"""
-        if self.timer_id:
-            GLib.source_remove(self.timer_id)
+        """Drive typing from the shared frame scheduler instead of one timeout per character"""
+        if self.typing_tick:
+            self.session.scheduler.remove(self.typing_tick)
         
-        self.timer_id = GLib.timeout_add(int(self.typing_delay), self.type_next_char)
+        self.last_frame_time = None
+        self.typing_tick = self.session.scheduler.add(self.on_typing_tick)
     
-    def type_next_char(self):
-        """Add the next character to the display"""
+    def on_typing_tick(self, frame_time):
+        """Scheduler callback that types all characters due since the last frame"""
+        if self.last_frame_time is None:
+            self.last_frame_time = frame_time
+            return True
+        
+        elapsed = frame_time - self.last_frame_time
+        self.last_frame_time = frame_time
+        
+        # Typed chunks are dropped, only the chunk being typed is kept
+        if self.char_index >= len(self.current_text):
+            self.next_text_chunk()
+        
+        with self.perf.timed("type_tick"):
+            available = len(self.current_text) - self.char_index
+            typing = self.type_next_chars(self.typing_model.chars_due(elapsed, available))
+        if typing:
+            return True
+        
+        self.typing_tick = None
+        return False
+    
+    def type_next_chars(self, count):
+        """Add the next count characters to the display, returning False once typing is complete"""
         if self.char_index < len(self.current_text):
-            # Add next character
-            char = self.current_text[self.char_index]
-            self.display_text += char
-            self.char_index += 1
-            self.chars_typed += 1
+            if count <= 0:
+                return True
             
-            # Update display
-            self.text_buffer.set_text(self.display_text + "█")  # Add cursor block
+            # Add the whole batch with a single buffer insert
+            chunk = self.current_text[self.char_index:self.char_index + count]
+            self.char_index += len(chunk)
+            self.chars_typed += len(chunk)
             
-            # Accelerate typing speed
-            if self.typing_delay > self.min_typing_delay:
-                self.typing_delay *= self.delay_decrease_rate
+            # Update display incrementally (cost independent of text already typed)
+            self.append_typed_text(chunk)
             
             # Only scroll when we add a newline to avoid jumpy behavior
-            if char == '\n':
-                # Scroll insert mark onscreen (gentler than scroll_to_iter)
-                insert_mark = self.text_buffer.get_insert()
-                self.text_view.scroll_mark_onscreen(insert_mark)
+            if '\n' in chunk:
+                # Scroll typing mark onscreen (gentler than scroll_to_iter)
+                self.text_view.scroll_mark_onscreen(self.typing_mark)
             
-            # Schedule next character
-            self.schedule_next_char()
-            return False
+            return True
+        elif not self.loading_done:
+            # Caught up with the loader, wait for more text
+            return True
         else:
             # Typing complete, start panning animation
             self.start_panning()
             return False
     
-    def start_cursor_blink(self):
-        """Start blinking cursor after typing is complete"""
-        if self.timer_id:
-            GLib.source_remove(self.timer_id)
-        
-        self.timer_id = GLib.timeout_add(500, self.blink_cursor)
-    
-    def blink_cursor(self):
-        """Toggle cursor visibility"""
-        self.blink_state = not self.blink_state
-        cursor = "█" if self.blink_state else " "
-        self.text_buffer.set_text(self.display_text + cursor)
-        
-        # No scrolling needed during cursor blink - content hasn't changed
-        
-        return True  # Continue blinking
+    def set_cursor_shown(self, shown):
+        """Show or hide the cursor glyph by recoloring its tag"""
+        self.blink_state = shown
+        color = self.CURSOR_COLOR if shown else self.BACKGROUND_COLOR
+        self.cursor_tag.set_property("foreground", color)
     
     def start_panning(self):
         """Start horizontal panning animation for long lines"""
-        if self.timer_id:
-            GLib.source_remove(self.timer_id)
-        
         # Calculate maximum horizontal scroll (content width - viewport width)
         # We'll get this in the pan_view method
-        self.pan_offset = 0
+        self.pan_offset = 0.0
         self.pan_direction = 1
         
         # Start with cursor visible
-        self.blink_state = True
-        self.text_buffer.set_text(self.display_text + "█")
+        self.set_cursor_shown(True)
+        
+        # Start panning on the shared scheduler, every frame
+        self.last_pan_time = None
+        self.pan_start_time = None
+        self.pan_tick = self.session.scheduler.add(self.on_pan_tick)
+        self.session.window_finished_typing()
+    
+    def stop_panning(self):
+        """Stop the panning and blinking before the next dataset starts"""
+        if self.pan_tick:
+            self.session.scheduler.remove(self.pan_tick)
+            self.pan_tick = None
+    
+    def on_pan_tick(self, frame_time):
+        """Scheduler callback moving the pan by the frame time elapsed, checked for late frames"""
+        if self.last_pan_time is None:
+            self.last_pan_time = self.pan_start_time = frame_time
+            return True
+        
+        elapsed = frame_time - self.last_pan_time
+        self.last_pan_time = frame_time
+        self.perf.record_frame_interval(elapsed, self.session.scheduler.frame_interval_ms)
+        
+        # Blink from the time since panning started, independent of the scroll position
+        shown = int((frame_time - self.pan_start_time) // self.CURSOR_BLINK_MS) % 2 == 0
+        if shown != self.blink_state:
+            self.set_cursor_shown(shown)
         
-        # Start panning timer
-        self.timer_id = GLib.timeout_add(self.PANNING_FRAME_INTERVAL_MS, self.pan_view)
+        if not self.perf.enabled:
+            return self.pan_view(elapsed)
+        with self.perf.timed("pan_view"):
+            return self.pan_view(elapsed)
     
-    def pan_view(self):
-        """Animate horizontal panning across the text"""
+    def pan_view(self, elapsed_ms):
+        """Animate horizontal panning across the text by elapsed_ms worth of motion"""
         # Get horizontal adjustment
         h_adj = self.scrolled_window.get_hadjustment()
         
         if not h_adj:
             return True
         
-        # Ensure pan_speed is not zero to avoid division by zero
-        if self.pan_speed <= 0:
-            self.pan_speed = 2
-        
         # Get viewport and content dimensions
         page_size = h_adj.get_page_size()
         upper = h_adj.get_upper()
         max_scroll = max(0, upper - page_size)
         
-        # If content fits in viewport, just blink cursor
+        # If content fits in viewport, the cursor blink is all that moves
         if max_scroll <= 0:
-            return self.blink_cursor()
+            return True
         
-        # Pan the view
-        self.pan_offset += self.pan_speed * self.pan_direction
+        # Ease out towards each edge and back in after reversing, never stopping completely
+        edge_distance = min(self.pan_offset, max_scroll - self.pan_offset)
+        ease = math.sin(min(1.0, max(0.0, edge_distance / self.PAN_EASE_PX)) * math.pi / 2)
+        speed = self.pan_speed * max(self.PAN_MIN_SPEED, ease)
+        
+        # Pan the view by the distance covered since the last frame
+        elapsed_ms = min(elapsed_ms, self.PAN_MAX_STEP_MS)
+        self.pan_offset += speed * elapsed_ms / 1000.0 * self.pan_direction
         
         # Reverse direction at boundaries
         if self.pan_offset >= max_scroll:
             self.pan_offset = max_scroll
             self.pan_direction = -1
         elif self.pan_offset <= 0:
-            self.pan_offset = 0
+            self.pan_offset = 0.0
             self.pan_direction = 1
         
-        # Apply the scroll position
-        h_adj.set_value(self.pan_offset)
-        
-        # Blink cursor periodically while panning
-        frame_count = int(self.pan_offset / self.pan_speed) % self.CURSOR_BLINK_FRAMES
-        if frame_count == 0:
-            self.blink_state = not self.blink_state
-            cursor = "█" if self.blink_state else " "
-            self.text_buffer.set_text(self.display_text + cursor)
+        # Apply the scroll position, only redrawing when it moves by a whole pixel
+        position = round(self.pan_offset)
+        if position != h_adj.get_value():
+            h_adj.set_value(position)
         
         return True  # Continue panning
     
+    def on_window_state(self, widget, event):
+        """Minimized or withdrawn windows draw nothing"""
+        hidden_states = Gdk.WindowState.ICONIFIED | Gdk.WindowState.WITHDRAWN
+        self.session.set_window_visible(self, not event.new_window_state & hidden_states)
+        return False
+    
+    def on_map_changed(self, widget, event, mapped):
+        """Unmapped windows draw nothing and their frame clocks stop"""
+        self.session.set_window_visible(self, mapped)
+        return False
+    
+    def on_visibility(self, widget, event):
+        """Windows fully covered by another surface, e.g. a lock screen, draw nothing (X11 only)"""
+        self.session.set_window_visible(self, event.state != Gdk.VisibilityState.FULLY_OBSCURED)
+        return False
+    
     def on_key_press(self, widget, event):
         """Exit on any key press"""
         Gtk.main_quit()
@@ -494,15 +751,42 @@ class RetroScreensaver(Gtk.Window):
 
 def main():
     """Main entry point"""
-    csv_folder = None
+    parser = argparse.ArgumentParser(description="CSV Retro Screensaver")
+    parser.add_argument("csv_folder", nargs="?",
+                        help="folder with data files (CSV, compressed CSV, Parquet, Arrow, JSON Lines, SQLite)")
+    parser.add_argument("--playlist", nargs="?", const="shuffle", choices=ScreensaverSession.PLAYLIST_MODES,
+                        help="cycle through datasets instead of showing one (default order: shuffle)")
+    parser.add_argument("--hud", action="store_true", help="show frame timing and memory overlay")
+    parser.add_argument("--stats-json", metavar="FILE", help="write timing histograms to FILE on exit")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="worker processes for files over 256 MB (0: one per CPU core, default: 1)")
+    parser.add_argument("--columns", metavar="COL,COL",
+                        help="only read and show these Parquet, Arrow or SQLite columns (a sidecar file overrides this)")
+    parser.add_argument("--where", action="append", metavar="EXPR",
+                        help="only show Parquet, Arrow or SQLite rows matching EXPR, e.g. 'total > 1000' (repeatable)")
+    parser.add_argument("--all-monitors", action="store_true",
+                        help="one window per monitor, all showing the same dataset loaded once")
+    parser.add_argument("--no-power-save", action="store_true",
+                        help="keep animating at full rate when hidden, blanked or on battery")
+    args = parser.parse_args()
+    if args.workers < 0:
+        parser.error("--workers must be 0 or more")
     
-    # Check for command-line argument
-    if len(sys.argv) > 1:
-        csv_folder = sys.argv[1]
+    selection = None
+    if args.columns or args.where:
+        try:
+            columns = args.columns and DatasetSelection.parse_columns(args.columns)
+            selection = DatasetSelection(columns, args.where)
+        except ValueError as e:
+            parser.error(str(e))
     
-    # Create and show window
-    win = RetroScreensaver(csv_folder)
-    win.show_all()
+    # Create and show the windows
+    session = ScreensaverSession(args.csv_folder, playlist_mode=args.playlist,
+                                 show_hud=args.hud, collect_stats=bool(args.stats_json),
+                                 workers=args.workers, selection=selection,
+                                 all_monitors=args.all_monitors,
+                                 power_aware=not args.no_power_save)
+    session.show_all()
     
     # Set cursor invisible after window is realized
     def set_cursor_invisible(window):
@@ -512,10 +796,14 @@ def main():
                 window.get_window().set_cursor(blank_cursor)
         return False
     
-    GLib.idle_add(set_cursor_invisible, win)
+    for win in session.windows:
+        GLib.idle_add(set_cursor_invisible, win)
     
     # Start GTK main loop
     Gtk.main()
+    
+    if args.stats_json:
+        session.perf.dump(args.stats_json)
 
 if __name__ == "__main__":
     main()
@@ -1,205 +1,259 @@
 #!/usr/bin/env python3
 """
 Demo script for CSV Retro Screensaver typing effect (terminal version)
-Demonstrates the typing animation without requiring GTK
+Demonstrates the typing animation without requiring GTK, and can run as a
+lightweight screensaver on headless/TTY-only machines
 """
 
-import csv
-import gzip
-import os
-import random
-import time
+import argparse
+import select
+import shutil
 import sys
-from pathlib import Path
-import pandas as pd
+import time
+from collections import deque
+from itertools import chain
 
-class TypingDemo:
-    """Demonstrates the typing effect in a terminal"""
+from screensaver_core import DataSource, DatasetSelection, TypingSpeedModel
+
+try:
+    import termios
+    import tty
+except ImportError:  # Not available on Windows
+    termios = None
+
+class TerminalRenderer:
+    """Frame-based ANSI renderer: types, scrolls and pans text with one write per frame"""
     
-    def __init__(self, csv_folder=None):
-        self.csv_folder = csv_folder or os.path.expanduser("~/.local/share/csv-screensaver/data")
-        self.typing_delay = 0.150  # Start with slow typing (seconds)
-        self.min_typing_delay = 0.020  # End with fast typing
-        self.delay_decrease_rate = 0.98
-    
-    def limit_dataset_rows(self, dataset, max_rows=10000):
-        """Limit dataset to header + max_rows randomly selected data rows"""
-        if len(dataset) > 1:
-            header = [dataset[0]]
-            data_rows = dataset[1:]
-            if len(data_rows) > max_rows:
-                data_rows = random.sample(data_rows, max_rows)
-            return header + data_rows
-        return dataset
-        
-    def load_csv_data(self):
-        """Load CSV files (including gzipped) and Parquet files"""
-        if not os.path.exists(self.csv_folder):
-            os.makedirs(self.csv_folder, exist_ok=True)
-            self.create_sample_csv()
-        
-        # Find CSV, gzipped CSV, and Parquet files
-        csv_files = list(Path(self.csv_folder).glob("*.csv"))
-        csv_gz_files = list(Path(self.csv_folder).glob("*.csv.gz"))
-        parquet_files = list(Path(self.csv_folder).glob("*.parquet"))
-        
-        all_files = csv_files + csv_gz_files + parquet_files
-        
-        if not all_files:
-            return "No CSV or Parquet files found in: " + self.csv_folder
+    CURSOR_GLYPH = "█"
+    
+    def __init__(self, out=None, fps=30, pan_speed=8):
+        self.out = out or sys.stdout
+        self.frame_interval = 1.0 / fps
+        self.pan_speed = pan_speed  # Columns per second while panning
+        self.cols, self.rows = shutil.get_terminal_size()
+        self.lines = deque([""], maxlen=self.rows)  # Visible lines, last one is being typed
+        self.previous_frame = []  # Rows as last written, for redrawing only what changed
+        self.pending = ""  # Text pulled from the source but not typed yet
+        self.pending_index = 0
+        self.source = iter(())
+        self.source_done = False
+        self.started_line = False
+        self.pan_position = 0.0
+        self.pan_direction = 1
+    
+    def start(self):
+        """Switch to the alternate screen with green on black and a hidden cursor"""
+        self.out.write("\033[?1049h\033[?25l\033[32m\033[40m\033[2J")
+        self.out.flush()
+    
+    def stop(self):
+        """Restore the terminal"""
+        self.out.write("\033[0m\033[?25h\033[?1049l")
+        self.out.flush()
+    
+    def reset(self, lines):
+        """Start typing a new sequence of lines on a cleared screen"""
+        self.lines = deque([""], maxlen=self.rows)
+        self.previous_frame = []
+        self.out.write("\033[2J")
+        self.pending = ""
+        self.pending_index = 0
+        self.source = iter(lines)
+        self.source_done = False
+        self.started_line = False
+        self.pan_position = 0.0
+        self.pan_direction = 1
+    
+    def fill_pending(self, wanted):
+        """Pull source lines until at least wanted characters are ready to type"""
+        pieces = [self.pending[self.pending_index:]]
+        available = len(pieces[0])
+        while available < wanted and not self.source_done:
+            line = next(self.source, None)
+            if line is None:
+                self.source_done = True
+                break
+            # Newlines go in front of every line but the first
+            piece = "\n" + line if self.started_line else line
+            self.started_line = True
+            pieces.append(piece)
+            available += len(piece)
+        self.pending = "".join(pieces)
+        self.pending_index = 0
+        return available
+    
+    def type_chars(self, count):
+        """Move count characters from the pending text onto the screen lines"""
+        chunk = self.pending[self.pending_index:self.pending_index + count]
+        self.pending_index += len(chunk)
+        segments = chunk.split("\n")
+        self.lines[-1] += segments[0]
+        for segment in segments[1:]:
+            self.lines.append(segment)
+    
+    def typing_finished(self):
+        """True once the source is exhausted and everything has been typed"""
+        return self.source_done and self.pending_index >= len(self.pending)
+    
+    def check_resize(self):
+        """Follow terminal size changes, forcing a full redraw"""
+        cols, rows = shutil.get_terminal_size()
+        if (cols, rows) != (self.cols, self.rows):
+            self.cols, self.rows = cols, rows
+            self.lines = deque(self.lines, maxlen=rows)
+            self.previous_frame = []
+            self.out.write("\033[2J")
+    
+    def advance_pan(self, elapsed):
+        """Bounce the horizontal offset between the left edge and the widest visible line"""
+        widest = max(len(line) for line in self.lines) + 1  # Room for the cursor
+        max_scroll = max(0, widest - self.cols)
+        if max_scroll <= 0:
+            self.pan_position = 0.0
+            return
         
-        # Use first file
-        data_file = all_files[0]
+        self.pan_position += self.pan_speed * elapsed * self.pan_direction
         
-        try:
-            # Load data based on file type (case-insensitive)
-            file_name_lower = data_file.name.lower()
-            if file_name_lower.endswith('.parquet'):
-                # Load Parquet file using pandas
-                df = pd.read_parquet(data_file)
-                # Convert to list of lists (header + rows) and limit rows
-                dataset = self.limit_dataset_rows(
-                    [df.columns.tolist()] + df.values.tolist()
-                )
-            elif file_name_lower.endswith('.csv.gz'):
-                # Load gzipped CSV file
-                with gzip.open(data_file, 'rt', newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    dataset = list(reader)
-                # Limit to header + 10,000 randomly selected rows
-                dataset = self.limit_dataset_rows(dataset)
-            else:
-                # Load regular CSV file
-                with open(data_file, 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    dataset = list(reader)
-                # Limit to header + 10,000 randomly selected rows
-                dataset = self.limit_dataset_rows(dataset)
-            
-            if dataset:
-                return self.format_data(dataset, data_file.name)
-            else:
-                return f"Empty file: {data_file.name}"
-        except Exception as e:
-            return f"Error loading file: {str(e)}"
+        # Reverse direction at boundaries
+        if self.pan_position >= max_scroll:
+            self.pan_position = max_scroll
+            self.pan_direction = -1
+        elif self.pan_position <= 0:
+            self.pan_position = 0.0
+            self.pan_direction = 1
     
-    def format_data(self, dataset, filename):
-        """Format CSV data for retro display"""
-        lines = []
-        
-        # Add retro header
-        lines.append("=" * 70)
-        lines.append("  DATA RETRIEVAL SYSTEM v1.0")
-        lines.append("  [ CLASSIFIED INFORMATION ]")
-        lines.append("=" * 70)
-        lines.append("")
-        lines.append(f"Loading file: {filename}")
-        lines.append("")
+    def render(self, cursor_shown):
+        """Write the rows that changed since the last frame in a single buffered write"""
+        offset = int(self.pan_position)
+        frame = [line[offset:offset + self.cols] for line in self.lines]
+        if cursor_shown and len(self.lines[-1]) - offset < self.cols:
+            frame[-1] += self.CURSOR_GLYPH
         
-        # Determine column widths (capped at 30 characters)
-        MAX_COL_WIDTH = 30
-        col_widths = []
-        if dataset:
-            num_cols = len(dataset[0])
-            for col_idx in range(num_cols):
-                max_width = max(
-                    (len(str(row[col_idx])) if col_idx < len(row) else 0)
-                    for row in dataset
-                )
-                # Cap width at MAX_COL_WIDTH
-                col_widths.append(min(max_width, MAX_COL_WIDTH))
+        output = []
+        for row, text in enumerate(frame):
+            if row >= len(self.previous_frame) or self.previous_frame[row] != text:
+                output.append(f"\033[{row + 1};1H{text}\033[K")
+        if output:
+            self.out.write("".join(output))
+            self.out.flush()
+        self.previous_frame = frame
+    
+    def wait_for_frame(self, timeout):
+        """Sleep until the next frame; returns True if a key was pressed meanwhile"""
+        if termios is not None and sys.stdin.isatty():
+            readable, _, _ = select.select([sys.stdin], [], [], max(0.0, timeout))
+            if readable:
+                sys.stdin.read(1)
+                return True
+            return False
+        time.sleep(max(0.0, timeout))
+        return False
+    
+    def run(self, lines, typing_model, hold_seconds=None):
+        """Type lines, then pan for hold_seconds (forever if None); returns False on a key press"""
+        self.reset(lines)
+        typing_model.reset()
+        last_time = time.monotonic()
+        finished_at = None
         
-        # Format headers
-        if dataset:
-            header_row = dataset[0]
-            header_line = " | ".join(
-                self._truncate_cell(str(cell), col_widths[i])
-                for i, cell in enumerate(header_row) if i < len(col_widths)
-            )
-            lines.append(header_line)
-            lines.append("-" * len(header_line))
+        while True:
+            now = time.monotonic()
+            elapsed = now - last_time
+            last_time = now
+            self.check_resize()
             
-            # Add data rows
-            for row in dataset[1:]:
-                if row:
-                    data_line = " | ".join(
-                        self._truncate_cell(str(cell), col_widths[i])
-                        for i, cell in enumerate(row) if i < len(col_widths)
-                    )
-                    lines.append(data_line)
-        
-        lines.append("")
-        lines.append("=" * 70)
-        lines.append("END OF DATA STREAM")
-        lines.append("=" * 70)
-        
-        return "\n".join(lines)
-    
-    def _truncate_cell(self, cell_text, max_width):
-        """Truncate cell content to max_width, adding ellipsis if needed"""
-        if len(cell_text) > max_width:
-            # Reserve 3 characters for ellipsis
-            if max_width >= 3:
-                return cell_text[:max_width - 3] + "..."
+            if finished_at is None:
+                # Type every character that is due this frame in one batch
+                available = self.fill_pending(typing_model.MAX_CHARS_PER_FRAME)
+                self.type_chars(typing_model.chars_due(elapsed * 1000, available))
+                if self.typing_finished():
+                    finished_at = now
+                cursor_shown = True
             else:
-                return cell_text[:max_width]
-        else:
-            return cell_text.ljust(max_width)
-    
-    def create_sample_csv(self):
-        """Create sample CSV files"""
-        # Sample: Retro computers
-        sample_path = os.path.join(self.csv_folder, "retro_computers.csv")
-        with open(sample_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(["Computer", "Year", "CPU", "RAM"])
-            writer.writerow(["Commodore 64", "1982", "MOS 6510", "64 KB"])
-            writer.writerow(["Apple II", "1977", "MOS 6502", "4 KB"])
-            writer.writerow(["IBM PC", "1981", "Intel 8088", "16 KB"])
-            writer.writerow(["Atari 800", "1979", "MOS 6502", "8 KB"])
-            writer.writerow(["ZX Spectrum", "1982", "Zilog Z80", "16 KB"])
-    
-    def type_text(self, text):
-        """Display text with typing effect"""
-        # Clear screen
-        print("\033[2J\033[H", end='')
-        
-        # Set green text on black background
-        print("\033[32m\033[40m", end='')
-        
-        current_delay = self.typing_delay
-        
-        for i, char in enumerate(text):
-            print(char, end='', flush=True)
+                self.advance_pan(elapsed)
+                cursor_shown = int((now - finished_at) * 2) % 2 == 0  # Blink every 500ms
+                if hold_seconds is not None and now - finished_at >= hold_seconds:
+                    return True
             
-            if char != '\n':  # Don't delay on newlines as much
-                time.sleep(current_delay)
-                
-                # Accelerate typing
-                if current_delay > self.min_typing_delay:
-                    current_delay *= self.delay_decrease_rate
-        
-        # Add blinking cursor
-        print("█", end='', flush=True)
-        
-        # Reset colors
-        print("\033[0m")
-        print("\n\nPress Ctrl+C to exit")
+            self.render(cursor_shown)
+            if self.wait_for_frame(self.frame_interval - (time.monotonic() - now)):
+                return False
+
+class TypingDemo:
+    """Demonstrates the typing effect in a terminal"""
+    
+    def __init__(self, csv_folder=None, playlist_mode=None, workers=1, selection=None):
+        # Same loaders, sampling, cache and formatter as the GTK screensaver
+        self.data_source = DataSource(csv_folder, workers=workers, selection=selection)
+        self.csv_folder = self.data_source.data_folder
+        self.playlist_mode = playlist_mode
+        self.typing_model = TypingSpeedModel()
+    
+    def load_csv_data(self):
+        """Pick a data file and return its display lines, formatted lazily"""
+        lines = self.data_source.load_lines(self.playlist_mode or "random")
+        data_file = self.data_source.last_file
+        filename = data_file.name if data_file else self.csv_folder
+        formatter = self.data_source.formatter
+        return chain(
+            formatter.banner_lines(f"Loading file: {filename}"),
+            lines,
+            formatter.footer_lines(),
+        )
+    
+    def run(self, renderer, hold_seconds=10, loop=False):
+        """Show one dataset, or keep cycling through datasets until a key is pressed"""
+        while renderer.run(self.load_csv_data(), self.typing_model, hold_seconds):
+            if not loop:
+                break
 
 def main():
     """Main entry point"""
-    csv_folder = None
-    if len(sys.argv) > 1:
-        csv_folder = sys.argv[1]
+    parser = argparse.ArgumentParser(description="CSV Retro Screensaver terminal demo")
+    parser.add_argument("csv_folder", nargs="?",
+                        help="folder with data files (CSV, compressed CSV, Parquet, Arrow, JSON Lines, SQLite)")
+    parser.add_argument("--fps", type=float, default=30, help="target frame rate (default: 30)")
+    parser.add_argument("--hold", type=float, default=10,
+                        help="seconds to keep panning after typing finishes (default: 10)")
+    parser.add_argument("--screensaver", action="store_true",
+                        help="cycle through datasets until a key is pressed")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="worker processes for files over 256 MB (0: one per CPU core, default: 1)")
+    parser.add_argument("--columns", metavar="COL,COL",
+                        help="only read and show these Parquet, Arrow or SQLite columns (a sidecar file overrides this)")
+    parser.add_argument("--where", action="append", metavar="EXPR",
+                        help="only show Parquet, Arrow or SQLite rows matching EXPR, e.g. 'total > 1000' (repeatable)")
+    args = parser.parse_args()
+    if args.workers < 0:
+        parser.error("--workers must be 0 or more")
+    
+    selection = None
+    if args.columns or args.where:
+        try:
+            columns = args.columns and DatasetSelection.parse_columns(args.columns)
+            selection = DatasetSelection(columns, args.where)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    demo = TypingDemo(args.csv_folder, playlist_mode="shuffle" if args.screensaver else None,
+                      workers=args.workers, selection=selection)
+    renderer = TerminalRenderer(fps=args.fps)
     
-    demo = TypingDemo(csv_folder)
-    text = demo.load_csv_data()
+    # Single key presses end the screensaver, so don't wait for Enter
+    saved_mode = None
+    if termios is not None and sys.stdin.isatty():
+        saved_mode = termios.tcgetattr(sys.stdin)
+        tty.setcbreak(sys.stdin)
     
+    renderer.start()
     try:
-        demo.type_text(text)
-        time.sleep(10)  # Keep visible for 10 seconds
+        demo.run(renderer, hold_seconds=args.hold, loop=args.screensaver)
     except KeyboardInterrupt:
-        print("\n\033[0m\nDemo terminated.")
+        pass
+    finally:
+        renderer.stop()
+        if saved_mode is not None:
+            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, saved_mode)
 
 if __name__ == "__main__":
     main()
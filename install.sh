@@ -16,6 +16,13 @@ echo "Installing screensaver script..."
 cp csv-screensaver.py /usr/bin/csv-screensaver
 chmod +x /usr/bin/csv-screensaver
 
+# Copy the shared core package used by the screensaver
+echo "Installing core library..."
+mkdir -p /usr/lib/csv-screensaver
+rm -rf /usr/lib/csv-screensaver/screensaver_core
+cp -r screensaver_core /usr/lib/csv-screensaver/
+find /usr/lib/csv-screensaver -name __pycache__ -prune -exec rm -rf {} +
+
 # Copy the desktop file
 echo "Installing desktop entry..."
 mkdir -p /usr/share/applications
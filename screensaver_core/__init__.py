@@ -0,0 +1,35 @@
+"""
+Shared core of the CSV Retro Screensaver: loaders, samplers, formatter,
+typing-speed model and instrumentation used by both the GTK screensaver
+and the terminal demo
+"""
+
+from .cache import DataFileIndex, DatasetCache, default_cache_dir
+from .feed import SharedTextFeed
+from .formats import FORMATS, DataFormat, FormatRegistry
+from .formatting import TableFormatter
+from .loaders import DatasetLoader
+from .selection import DatasetSelection
+from .source import DEFAULT_DATA_FOLDER, DataSource
+from .stats import PerfStats
+from .table import ColumnarTable, RowView
+from .typing_model import TypingSpeedModel
+
+__all__ = [
+    "ColumnarTable",
+    "DEFAULT_DATA_FOLDER",
+    "DataFormat",
+    "DataFileIndex",
+    "DataSource",
+    "DatasetCache",
+    "DatasetLoader",
+    "DatasetSelection",
+    "FORMATS",
+    "FormatRegistry",
+    "PerfStats",
+    "RowView",
+    "SharedTextFeed",
+    "TableFormatter",
+    "TypingSpeedModel",
+    "default_cache_dir",
+]
@@ -0,0 +1,251 @@
+"""
+On-disk caches: sampled datasets and the index of data files
+"""
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import random
+import zlib
+from pathlib import Path
+
+from .formats import FORMATS
+from .table import ColumnarTable
+
+def default_cache_dir():
+    """~/.cache/csv-screensaver, honoring XDG_CACHE_HOME"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "csv-screensaver")
+
+class DatasetCache:
+    """On-disk cache of sampled rows and column widths, keyed by file path, size and mtime"""
+    
+    FORMAT_VERSION = 3  # Entries hold the key, then a ColumnarTable
+    
+    def __init__(self, cache_dir=None, max_bytes=64 * 1024 * 1024):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+    
+    def _entry_path(self, data_file):
+        """Cache entry file for a data file"""
+        digest = hashlib.sha1(os.path.abspath(data_file).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".cache")
+    
+    def _file_key(self, data_file, variant=None):
+        """Identity of the data file contents (and how they were selected) as seen by the cache"""
+        stat = os.stat(data_file)
+        return (self.FORMAT_VERSION, os.path.abspath(data_file), stat.st_size, stat.st_mtime_ns, variant)
+    
+    def load(self, data_file, variant=None):
+        """Return (dataset, col_widths) for data_file, or None on a miss
+        
+        The key is unpickled and checked before the dataset, so stale
+        entries are rejected without importing the classes they refer to.
+        """
+        entry_path = self._entry_path(data_file)
+        try:
+            with open(entry_path, "rb") as f:
+                entry = io.BytesIO(zlib.decompress(f.read()))
+            if pickle.load(entry) != self._file_key(data_file, variant):
+                return None
+            dataset, col_widths = pickle.load(entry)
+            # Bump the entry's mtime so eviction is least-recently-used
+            os.utime(entry_path)
+        except Exception:
+            return None  # Unreadable or written by another version, the file is loaded again
+        return dataset, col_widths
+    
+    def store(self, data_file, dataset, col_widths, variant=None):
+        """Save the sampled dataset (as a ColumnarTable) and evict old entries"""
+        # The table's string pools pickle as a few large buffers
+        if not isinstance(dataset, ColumnarTable):
+            dataset = ColumnarTable.from_rows(dataset)
+        entry_path = self._entry_path(data_file)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            payload = zlib.compress(
+                pickle.dumps(self._file_key(data_file, variant), protocol=pickle.HIGHEST_PROTOCOL)
+                + pickle.dumps((dataset, col_widths), protocol=pickle.HIGHEST_PROTOCOL)
+            )
+            # Write to a temporary file first so readers never see a partial entry
+            tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, entry_path)
+            self.evict()
+        except OSError:
+            pass  # The cache is best effort
+    
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".cache"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            os.remove(path)
+            total_bytes -= size
+
+class DataFileIndex:
+    """Index of candidate data files in a folder tree, refreshed incrementally by directory mtime"""
+    
+    FORMAT_VERSION = 1
+    
+    def __init__(self, data_folder, cache_dir=None, formats=None):
+        cache_dir = cache_dir or default_cache_dir()
+        self.formats = formats or FORMATS  # FormatRegistry deciding which files are data files
+        self.data_folder = os.path.abspath(data_folder)
+        digest = hashlib.sha1(self.data_folder.encode("utf-8")).hexdigest()
+        self.index_path = os.path.join(cache_dir, f"index-{digest}.json")
+        self.dirs = {}  # Relative dir path -> {"mtime_ns", "subdirs", "files"}
+        self.files = []  # Flat list of relative file paths for O(1) selection
+        self.shuffle_order = []  # Files left in the current shuffle round
+        self.dirty = False
+    
+    def file_format(self, name):
+        """Return the data format for a file name, or None if it is not a data file"""
+        data_format = self.formats.find(name)
+        return data_format.name if data_format else None
+    
+    def load(self):
+        """Read the saved index, starting empty if it is missing or stale"""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # A newly registered format means every folder must be listed again
+            if (data.get("version") == self.FORMAT_VERSION and data.get("folder") == self.data_folder
+                    and data.get("formats") == self.formats.signature()):
+                self.dirs = data["dirs"]
+        except (OSError, ValueError, KeyError):
+            self.dirs = {}
+    
+    def save(self):
+        """Write the index if anything changed since it was loaded"""
+        if not self.dirty:
+            return
+        data = {"version": self.FORMAT_VERSION, "folder": self.data_folder,
+                "formats": self.formats.signature(), "dirs": self.dirs}
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+            self.dirty = False
+        except OSError:
+            pass  # The index is best effort, it is rebuilt next time
+    
+    def refresh(self):
+        """Bring the index up to date, only listing directories whose mtime changed"""
+        if not self.dirs:
+            self.load()
+        
+        seen = set()
+        visited = set()  # (device, inode) of every listed directory, so symlink loops end
+        pending = [""]
+        while pending:
+            rel_dir = pending.pop()
+            try:
+                stat = os.stat(os.path.join(self.data_folder, rel_dir))
+            except OSError:
+                continue
+            if (stat.st_dev, stat.st_ino) in visited:
+                continue  # Reached again through a directory symlink
+            visited.add((stat.st_dev, stat.st_ino))
+            seen.add(rel_dir)
+            mtime_ns = stat.st_mtime_ns
+            
+            entry = self.dirs.get(rel_dir)
+            if entry is None or entry["mtime_ns"] != mtime_ns:
+                entry = self.scan_dir(rel_dir, mtime_ns, entry)
+                self.dirs[rel_dir] = entry
+                self.dirty = True
+            pending.extend(entry["subdirs"])
+        
+        # Forget directories that were removed
+        for rel_dir in list(self.dirs):
+            if rel_dir not in seen:
+                del self.dirs[rel_dir]
+                self.dirty = True
+        
+        self.files = [
+            os.path.join(rel_dir, name)
+            for rel_dir, entry in self.dirs.items()
+            for name in entry["files"]
+        ]
+        self.save()
+    
+    def scan_dir(self, rel_dir, mtime_ns, old_entry=None):
+        """List one directory, keeping known row counts of unchanged files"""
+        old_files = old_entry["files"] if old_entry else {}
+        subdirs = []
+        files = {}
+        try:
+            it = os.scandir(os.path.join(self.data_folder, rel_dir))
+        except OSError:
+            # Unreadable (e.g. lost+found); no mtime, so it is tried again next refresh
+            return {"mtime_ns": None, "subdirs": subdirs, "files": files}
+        with it:
+            for dir_entry in it:
+                if dir_entry.name.startswith("."):
+                    continue
+                try:
+                    if dir_entry.is_dir():
+                        subdirs.append(os.path.join(rel_dir, dir_entry.name))
+                        continue
+                    fmt = self.file_format(dir_entry.name)
+                    if fmt is None:
+                        continue
+                    stat = dir_entry.stat()
+                except OSError:
+                    continue  # Unreadable entry or broken symlink
+                info = {"format": fmt, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "rows": None}
+                old_info = old_files.get(dir_entry.name)
+                if old_info and old_info["size"] == info["size"] and old_info["mtime_ns"] == info["mtime_ns"]:
+                    info["rows"] = old_info["rows"]
+                files[dir_entry.name] = info
+        return {"mtime_ns": mtime_ns, "subdirs": subdirs, "files": files}
+    
+    def choose(self, mode="random"):
+        """Pick an indexed file, or None if there are none
+        
+        mode is "random" (uniform, repeats allowed), "shuffle" (every file
+        once per round) or "weighted" (larger files are picked more often).
+        """
+        if not self.files:
+            return None
+        
+        if mode == "shuffle":
+            file_set = set(self.files)
+            while self.shuffle_order:
+                rel_path = self.shuffle_order.pop()
+                if rel_path in file_set:  # Skip files removed since the round started
+                    return Path(self.data_folder, rel_path)
+            self.shuffle_order = random.sample(self.files, len(self.files))
+            return Path(self.data_folder, self.shuffle_order.pop())
+        
+        if mode == "weighted":
+            weights = []
+            for rel_path in self.files:
+                entry = self.dirs[os.path.dirname(rel_path)]
+                weights.append(entry["files"][os.path.basename(rel_path)]["size"] + 1)
+            return Path(self.data_folder, random.choices(self.files, weights)[0])
+        
+        return Path(self.data_folder, random.choice(self.files))
+    
+    def record_rows(self, data_file, row_count):
+        """Remember the number of data rows once a file has been read"""
+        rel_path = os.path.relpath(data_file, self.data_folder)
+        entry = self.dirs.get(os.path.dirname(rel_path))
+        info = entry["files"].get(os.path.basename(rel_path)) if entry else None
+        if info is not None and info["rows"] != row_count:
+            info["rows"] = row_count
+            self.dirty = True
+            self.save()
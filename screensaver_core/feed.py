@@ -0,0 +1,63 @@
+"""
+Text feed shared by several displays of the same dataset
+"""
+
+import queue
+import threading
+from collections import deque
+
+class SharedTextFeed:
+    """Bounded feed of formatted text chunks that every reader consumes independently
+    
+    Behaves like a queue.Queue(maxsize=max_ahead) per reader while holding
+    each chunk only once: a chunk is dropped when all readers are past it,
+    and put() blocks while the slowest reader is max_ahead chunks behind.
+    """
+    
+    def __init__(self, readers=1, max_ahead=4):
+        self.condition = threading.Condition()
+        self.chunks = deque()
+        self.first_index = 0  # Feed position of chunks[0]
+        self.positions = [0] * readers  # Next feed position of each reader
+        self.max_ahead = max_ahead
+    
+    def put(self, chunk):
+        """Append a chunk, waiting until the slowest reader is close enough"""
+        with self.condition:
+            while self.first_index + len(self.chunks) - min(self.positions) >= self.max_ahead:
+                self.condition.wait()
+            self.chunks.append(chunk)
+    
+    def get_nowait(self, reader):
+        """Next chunk for one reader; raises queue.Empty if it has caught up"""
+        with self.condition:
+            position = self.positions[reader]
+            if position >= self.first_index + len(self.chunks):
+                raise queue.Empty
+            chunk = self.chunks[position - self.first_index]
+            self.positions[reader] = position + 1
+            
+            # Forget chunks every reader has taken and wake the producer
+            slowest = min(self.positions)
+            while self.chunks and self.first_index < slowest:
+                self.chunks.popleft()
+                self.first_index += 1
+            self.condition.notify_all()
+            return chunk
+    
+    def reader(self, reader):
+        """Queue-like view (with get_nowait()) for one reader"""
+        return FeedReader(self, reader)
+
+class FeedReader:
+    """One reader's view of a SharedTextFeed"""
+    
+    __slots__ = ("feed", "reader")
+    
+    def __init__(self, feed, reader):
+        self.feed = feed
+        self.reader = reader
+    
+    def get_nowait(self):
+        """Next chunk for this reader; raises queue.Empty if it has caught up"""
+        return self.feed.get_nowait(self.reader)
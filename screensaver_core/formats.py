@@ -0,0 +1,348 @@
+"""
+Data file formats, looked up by file name suffix in a registry that plug-in formats can join
+"""
+
+import csv
+import importlib
+import json
+import os
+import sqlite3
+from contextlib import closing
+from functools import partial
+from itertools import chain
+from pathlib import Path
+
+from .sampling import sample_group_rows
+from .table import ColumnarTable
+
+class DataFormat:
+    """One file format: the name suffixes it claims and how a sample is read from it
+    
+    Streaming formats only implement read_rows(), a generator of the header
+    followed by every data row, which load() reservoir-samples. Formats with
+    random access override load() to read just the sampled rows, and may
+    override load_parallel() to split very large files across processes.
+    Either way load() sets loader.rows_seen to the number of data rows.
+    """
+    
+    name = None  # Short name stored in the file index
+    suffixes = ()  # Lower-case file name endings, e.g. (".csv",)
+    
+    def read_rows(self, data_file):
+        """Generator of the header and then each data row of a file"""
+        raise NotImplementedError
+    
+    def load(self, loader, data_file, selection=None):
+        """Header + sampled rows of a file (a ColumnarTable, or [] without a header)"""
+        with closing(self.read_rows(data_file)) as rows:
+            return loader.load_rows_in_stream(rows)
+    
+    def load_parallel(self, loader, data_file, selection=None):
+        """Sample a large file across worker processes, or return None to load it in-process"""
+        return None
+    
+    def cell_text(self, value):
+        """Display text of a value read from a typed format (Parquet, Arrow, JSON, SQLite)"""
+        if value is None:
+            return ""
+        if isinstance(value, str):
+            return value
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return bytes(value).hex()
+        if isinstance(value, (bool, dict, list, tuple)):
+            # Nested values and booleans look the same whichever format they come from
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+        return str(value)
+
+class CsvFormat(DataFormat):
+    """Plain CSV, sampled at random offsets through mmap when large"""
+    
+    name = "csv"
+    suffixes = (".csv",)
+    
+    def read_rows(self, data_file):
+        with open(data_file, 'r', newline='', encoding='utf-8') as f:
+            yield from csv.reader(f)
+    
+    def load(self, loader, data_file, selection=None):
+        # Large CSV files are sampled through mmap, touching only the chosen lines
+        if os.path.getsize(data_file) >= loader.MMAP_MIN_BYTES:
+            dataset = loader.load_csv_mmap(data_file)
+            if dataset is not None:
+                return dataset
+        return super().load(loader, data_file, selection)
+    
+    def load_parallel(self, loader, data_file, selection=None):
+        result = loader.parallel_sampler().sample_csv(data_file, loader.max_rows)
+        if result is None:
+            return None  # Quoted fields span lines, so byte ranges cannot split the file
+        loader.rows_seen, dataset = result
+        return dataset
+
+class CompressedCsvFormat(DataFormat):
+    """CSV in one compressed stream, decompressed while it is read
+    
+    modules are tried in order and imported on first use; each must have a
+    gzip.open()-style open(). The last one, usually a package to install,
+    is named if none is available.
+    """
+    
+    def __init__(self, name, suffixes, modules):
+        self.name = name
+        self.suffixes = tuple(suffixes)
+        self.modules = tuple(modules)
+    
+    def codec(self):
+        """The first importable decompression module"""
+        for module_name in self.modules:
+            try:
+                return importlib.import_module(module_name)
+            except ImportError:
+                continue
+        raise RuntimeError(f"Reading {self.suffixes[0]} files needs the {self.modules[-1]} module")
+    
+    def read_rows(self, data_file):
+        with self.codec().open(data_file, 'rt', newline='', encoding='utf-8') as f:
+            yield from csv.reader(f)
+
+class GzipCsvFormat(CompressedCsvFormat):
+    """Gzipped CSV; large multi-member (e.g. BGZF) files are sampled from a few members"""
+    
+    def __init__(self):
+        super().__init__("csv.gz", (".csv.gz",), ("gzip",))
+    
+    def load(self, loader, data_file, selection=None):
+        # Large multi-member files are sampled from a few members via the seek-point index
+        if os.path.getsize(data_file) >= loader.GZIP_INDEX_MIN_BYTES:
+            dataset = loader.load_csv_gz_indexed(data_file)
+            if dataset is not None:
+                return dataset
+        return super().load(loader, data_file, selection)
+
+class ParquetFormat(DataFormat):
+    """Parquet, reading only the row groups and columns that hold sampled rows"""
+    
+    name = "parquet"
+    suffixes = (".parquet",)
+    
+    def load(self, loader, data_file, selection=None):
+        return loader.load_parquet_in_chunks(data_file, selection=selection, cell_text=self.cell_text)
+    
+    def load_parallel(self, loader, data_file, selection=None):
+        if selection and selection.filters:
+            return None  # Row filters are evaluated in-process
+        try:
+            loader.rows_seen, dataset = loader.parallel_sampler().sample_parquet(
+                data_file, loader.max_rows, selection, self.cell_text
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to load parquet file {data_file} in parallel: {e}") from e
+        return dataset
+
+class ArrowIpcFormat(DataFormat):
+    """Arrow IPC files and streams (including Feather), memory-mapped so only sampled rows are copied"""
+    
+    name = "arrow"
+    suffixes = (".arrow", ".arrows", ".feather", ".ipc")
+    
+    def record_batches(self, source, data_file):
+        """(record batches, schema) of an open memory map; the batches point into the map"""
+        import pyarrow as pa
+        from pyarrow import ipc
+        
+        try:
+            reader = ipc.open_file(source)
+            return [reader.get_batch(idx) for idx in range(reader.num_record_batches)], reader.schema
+        except pa.ArrowInvalid:
+            source.seek(0)
+        try:
+            reader = ipc.open_stream(source)
+            return list(reader), reader.schema
+        except pa.ArrowInvalid:
+            pass
+        
+        # Feather version 1 predates the IPC file format
+        from pyarrow import feather
+        table = feather.read_table(str(data_file), memory_map=True)
+        return table.to_batches(), table.schema
+    
+    def load(self, loader, data_file, selection=None):
+        # Imported here so pyarrow is only loaded when an Arrow file is picked
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        
+        max_rows = loader.max_rows
+        try:
+            with pa.memory_map(str(data_file), 'r') as source:
+                batches, schema = self.record_batches(source, data_file)
+                names = schema.names
+                columns = selection.project(names) if selection else names
+                filters = selection.applicable_filters(names) if selection else []
+                dataset = loader.new_table(columns)
+                
+                # (batch, matching local row indices or None for all, candidate count)
+                candidates = []
+                for batch in batches:
+                    if filters:
+                        mask = selection.filter_mask(pa.Table.from_batches([batch]), filters)
+                        batch_rows = pc.indices_nonzero(mask).to_pylist()
+                        candidates.append((batch, batch_rows, len(batch_rows)))
+                    else:
+                        candidates.append((batch, None, batch.num_rows))
+                counts = [count for _, _, count in candidates]
+                loader.rows_seen = sum(counts)
+                
+                # Only the sampled rows of the selected columns leave the memory map
+                for candidate_idx, positions in sample_group_rows(counts, max_rows):
+                    batch, batch_rows, _ = candidates[candidate_idx]
+                    local_indices = positions if batch_rows is None else [batch_rows[p] for p in positions]
+                    table = pa.Table.from_batches([batch]).select(columns).take(local_indices)
+                    dataset.append_columns([column.to_pylist() for column in table.columns], self.cell_text)
+        except Exception as e:
+            raise RuntimeError(f"Failed to read Arrow file {data_file}: {e}") from e
+        
+        return dataset
+
+class JsonLinesFormat(DataFormat):
+    """JSON Lines: one object per line keyed by column, or arrays after a header array
+    
+    Columns are the keys of the first object; keys that first appear later
+    are not shown. Only the sampled lines are parsed.
+    """
+    
+    name = "jsonl"
+    suffixes = (".jsonl", ".ndjson")
+    
+    def record_cells(self, record, header):
+        """Cell values of one parsed line in header order"""
+        if isinstance(record, dict):
+            return [self.cell_text(record.get(name)) for name in header]
+        if isinstance(record, list):
+            return [self.cell_text(value) for value in record]
+        raise ValueError(f"expected a JSON object or array per line, got {record!r}")
+    
+    def pack_line(self, line, header, max_cell_chars):
+        """Parse one sampled line into a packed row"""
+        return ColumnarTable.pack_row(self.record_cells(json.loads(line), header), max_cell_chars)
+    
+    def load(self, loader, data_file, selection=None):
+        try:
+            with open(data_file, 'rb') as f:
+                lines = (line for line in f if line.strip())
+                first_line = next(lines, None)
+                if first_line is None:
+                    return []
+                first = json.loads(first_line)
+                if isinstance(first, list):
+                    header = [self.cell_text(name) for name in first]  # A header line
+                else:
+                    header = list(first) if isinstance(first, dict) else []
+                    lines = chain([first_line], lines)
+                
+                dataset = loader.new_table(header)
+                pack_line = partial(self.pack_line, header=header, max_cell_chars=loader.MAX_CELL_CHARS)
+                for packed in loader.reservoir_sample(lines, keep=pack_line):
+                    dataset.append_packed(packed)
+        except ValueError as e:
+            raise RuntimeError(f"Failed to read JSON Lines file {data_file}: {e}") from e
+        return dataset
+
+class SqliteFormat(DataFormat):
+    """SQLite database, opened read-only; its table with the most rows is shown"""
+    
+    name = "sqlite"
+    suffixes = (".sqlite", ".sqlite3", ".db3")
+    
+    def quote(self, identifier):
+        """SQL identifier quoting for table and column names"""
+        return '"' + identifier.replace('"', '""') + '"'
+    
+    def load(self, loader, data_file, selection=None):
+        max_rows = loader.max_rows
+        uri = Path(data_file).absolute().as_uri() + "?mode=ro"
+        try:
+            with closing(sqlite3.connect(uri, uri=True)) as connection:
+                tables = [name for (name,) in connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+                )]
+                if not tables:
+                    return []
+                counts = {
+                    name: connection.execute(f"SELECT COUNT(*) FROM {self.quote(name)}").fetchone()[0]
+                    for name in tables
+                }
+                table = max(sorted(tables), key=counts.get)
+                
+                names = [info[1] for info in connection.execute(f"PRAGMA table_info({self.quote(table)})")]
+                columns = selection.project(names) if selection else names
+                filters = selection.applicable_filters(names) if selection else []
+                dataset = loader.new_table(columns)
+                
+                # Filters become a parameterized WHERE clause, evaluated by SQLite
+                where = ""
+                params = [value for _, _, value in filters]
+                if filters:
+                    where = " WHERE " + " AND ".join(f"{self.quote(column)} {op} ?" for column, op, _ in filters)
+                    loader.rows_seen = connection.execute(
+                        f"SELECT COUNT(*) FROM {self.quote(table)}{where}", params
+                    ).fetchone()[0]
+                else:
+                    loader.rows_seen = counts[table]
+                if max_rows <= 0:
+                    return dataset
+                
+                # SQLite keeps only the max_rows lowest random keys while it scans
+                query = f"SELECT {', '.join(map(self.quote, columns))} FROM {self.quote(table)}{where}"
+                if loader.rows_seen > max_rows:
+                    query += " ORDER BY RANDOM()"
+                for row in connection.execute(query + " LIMIT ?", params + [max_rows]):
+                    dataset.append([self.cell_text(value) for value in row])
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to read SQLite database {data_file}: {e}") from e
+        
+        return dataset
+
+class FormatRegistry:
+    """Data formats by file name suffix; a plug-in format joins with register()"""
+    
+    def __init__(self, formats=()):
+        self.formats = []
+        for data_format in formats:
+            self.register(data_format)
+    
+    def register(self, data_format):
+        """Add a format (a DataFormat instance), replacing any with the same name; returns it"""
+        self.formats = [f for f in self.formats if f.name != data_format.name] + [data_format]
+        return data_format
+    
+    def get(self, name):
+        """The registered format with this name, or None"""
+        return next((f for f in self.formats if f.name == name), None)
+    
+    def find(self, file_name):
+        """The format claiming a file name (the longest matching suffix wins), or None"""
+        name_lower = str(file_name).lower()
+        best, best_length = None, 0
+        for data_format in self.formats:
+            for suffix in data_format.suffixes:
+                if len(suffix) > best_length and name_lower.endswith(suffix):
+                    best, best_length = data_format, len(suffix)
+        return best
+    
+    def signature(self):
+        """JSON-friendly list of names and suffixes, so saved file indexes notice new formats"""
+        return sorted([f.name, list(f.suffixes)] for f in self.formats)
+
+# Built-in formats; register more on FORMATS before creating a DataSource
+FORMATS = FormatRegistry([
+    CsvFormat(),
+    GzipCsvFormat(),
+    CompressedCsvFormat("csv.bz2", (".csv.bz2",), ("bz2",)),
+    CompressedCsvFormat("csv.xz", (".csv.xz", ".csv.lzma"), ("lzma",)),
+    # Python 3.14 ships zstd support, older versions need the zstandard package
+    CompressedCsvFormat("csv.zst", (".csv.zst", ".csv.zstd"), ("compression.zstd", "zstandard")),
+    ParquetFormat(),
+    ArrowIpcFormat(),
+    JsonLinesFormat(),
+    SqliteFormat(),
+])
@@ -0,0 +1,100 @@
+"""
+Retro table formatting: banner, column widths and streamed table lines
+"""
+
+from .table import ColumnarTable
+
+class TableFormatter:
+    """Formats a header + rows dataset as fixed-width retro terminal lines"""
+    
+    MAX_COL_WIDTH = 30
+    
+    def __init__(self):
+        self.col_widths = []  # Widths used for the last formatted dataset
+    
+    def banner_lines(self, status_line="Initializing data stream..."):
+        """Retro header typed before the table"""
+        return [
+            "=" * 70,
+            "  DATA RETRIEVAL SYSTEM v1.0",
+            "  [ CLASSIFIED INFORMATION ]",
+            "=" * 70,
+            "",
+            status_line,
+            "",
+        ]
+    
+    def footer_lines(self):
+        """Closing lines typed after the last data row"""
+        return [
+            "",
+            "=" * 70,
+            "END OF DATA STREAM",
+            "=" * 70,
+        ]
+    
+    def prepare_display_text(self, dataset, col_widths=None):
+        """Format CSV data for retro display, returning a generator of table lines"""
+        if not dataset:
+            return iter(())
+        
+        # Column widths come from the whole sample: some loaders return rows in file order
+        if col_widths is None:
+            col_widths = self.estimate_column_widths(dataset)
+        self.col_widths = col_widths
+        
+        return self.format_table_lines(dataset, col_widths)
+    
+    def estimate_column_widths(self, rows):
+        """Compute column widths (capped at MAX_COL_WIDTH) in a single pass over rows"""
+        if isinstance(rows, ColumnarTable):
+            # Read from the stored cell lengths without decoding the rows
+            return [min(width, self.MAX_COL_WIDTH) for width in rows.column_widths()]
+        
+        rows = iter(rows)
+        header_row = next(rows, None)
+        if header_row is None:
+            return []
+        
+        col_widths = [min(len(str(cell)), self.MAX_COL_WIDTH) for cell in header_row]
+        num_cols = len(col_widths)
+        for row in rows:
+            for col_idx, cell in enumerate(row[:num_cols]):
+                width = len(str(cell))
+                if width > col_widths[col_idx]:
+                    col_widths[col_idx] = min(width, self.MAX_COL_WIDTH)
+        return col_widths
+    
+    def format_table_lines(self, rows, col_widths):
+        """Yield the header, separator and data lines of the table one at a time"""
+        rows = iter(rows)
+        header_row = next(rows, None)
+        if header_row is None:
+            return
+        
+        # Format headers if first row looks like headers
+        header_line = " | ".join(
+            self._truncate_cell(str(cell), col_widths[i])
+            for i, cell in enumerate(header_row) if i < len(col_widths)
+        )
+        yield header_line
+        yield "-" * len(header_line)
+        
+        # Add data rows
+        for row in rows:
+            if row:  # Skip empty rows
+                yield " | ".join(
+                    self._truncate_cell(str(cell), col_widths[i])
+                    for i, cell in enumerate(row) if i < len(col_widths)
+                )
+    
+    def _truncate_cell(self, cell_text, max_width):
+        """Truncate cell content to max_width, adding ellipsis if needed"""
+        if len(cell_text) > max_width:
+            # Reserve 3 characters for ellipsis
+            if max_width >= 3:
+                return cell_text[:max_width - 3] + "..."
+            else:
+                return cell_text[:max_width]
+        else:
+            return cell_text.ljust(max_width)
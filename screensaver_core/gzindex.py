@@ -0,0 +1,145 @@
+"""
+Seek-point index of gzip members, giving random access into multi-member and BGZF files
+"""
+
+import hashlib
+import json
+import os
+import struct
+import zlib
+
+from .cache import default_cache_dir
+
+class GzipMemberIndex:
+    """Compressed offset and length of every gzip member of a file, cached on disk
+    
+    Each member also records whether its data starts on a line boundary,
+    i.e. the members before it end with a newline.
+    """
+    
+    FORMAT_VERSION = 2
+    SUFFIX = ".gzidx"
+    READ_SIZE = 1024 * 1024
+    
+    def __init__(self, data_file, cache_dir=None):
+        self.data_file = os.path.abspath(data_file)
+        digest = hashlib.sha1(self.data_file.encode("utf-8")).hexdigest()
+        # Next to the data if the folder is writable, otherwise in the cache folder
+        self.index_paths = [
+            self.data_file + self.SUFFIX,
+            os.path.join(cache_dir or default_cache_dir(), f"gzidx-{digest}.json"),
+        ]
+        self.members = []  # (offset, length, starts line) triples in file order
+        self._at_line_start = True  # Whether the data scanned so far ends with a newline
+    
+    def _file_key(self):
+        """Identity of the data file contents as seen by the index"""
+        stat = os.stat(self.data_file)
+        return [self.FORMAT_VERSION, stat.st_size, stat.st_mtime_ns]
+    
+    def load(self):
+        """Read a saved index, returning False if none matches the current file"""
+        key = self._file_key()
+        for index_path in self.index_paths:
+            try:
+                with open(index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if data.get("key") == key:
+                self.members = [tuple(member) for member in data["members"]]
+                return True
+        return False
+    
+    def save(self):
+        """Write the index to the first location that accepts it"""
+        payload = json.dumps({"key": self._file_key(), "members": self.members})
+        for index_path in self.index_paths:
+            try:
+                os.makedirs(os.path.dirname(index_path), exist_ok=True)
+                tmp_path = f"{index_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                os.replace(tmp_path, index_path)
+                return
+            except OSError:
+                continue  # Read-only data folder, try the cache folder
+    
+    def load_or_build(self):
+        """Load the saved index or scan the file once and save it"""
+        if not self.load():
+            self.build()
+            self.save()
+        return self.members
+    
+    def build(self):
+        """Find member boundaries, from BGZF block sizes when present, otherwise by inflating"""
+        self.members = []
+        self._at_line_start = True
+        with open(self.data_file, "rb") as f:
+            offset = self._scan_bgzf(f)
+            self._scan_inflate(f, offset)
+        return self.members
+    
+    def _track_line_start(self, data):
+        """Note whether decompressed data seen so far ends on a line boundary"""
+        if data:
+            self._at_line_start = data.endswith(b"\n")
+    
+    def _scan_bgzf(self, f):
+        """Walk BGZF blocks (size in the 'BC' extra field of each header); returns where it stopped"""
+        offset = 0
+        while True:
+            f.seek(offset)
+            header = f.read(18)
+            if len(header) < 18 or header[:2] != b"\x1f\x8b" or not header[3] & 4:
+                return offset
+            extra_len = struct.unpack("<H", header[10:12])[0]
+            f.seek(offset + 12)
+            extra = f.read(extra_len)
+            block_size = None
+            pos = 0
+            while pos + 4 <= len(extra):
+                sub_id, sub_len = extra[pos:pos + 2], struct.unpack("<H", extra[pos + 2:pos + 4])[0]
+                if sub_id == b"BC" and sub_len == 2:
+                    block_size = struct.unpack("<H", extra[pos + 4:pos + 6])[0] + 1
+                    break
+                pos += 4 + sub_len
+            if block_size is None:
+                return offset
+            self.members.append((offset, block_size, self._at_line_start))
+            f.seek(offset)
+            self._track_line_start(zlib.decompress(f.read(block_size), 31))
+            offset += block_size
+    
+    def _scan_inflate(self, f, offset):
+        """Inflate the rest of the file once, recording where each member ends"""
+        f.seek(offset)
+        decompressor = zlib.decompressobj(31)
+        member_start = offset
+        member_starts_line = self._at_line_start
+        fed = offset  # Compressed bytes consumed so far
+        while True:
+            data = f.read(self.READ_SIZE)
+            if not data:
+                break
+            fed += len(data)
+            while data:
+                self._track_line_start(decompressor.decompress(data))
+                if not decompressor.eof:
+                    break
+                # Member complete: whatever was not consumed starts the next one
+                data = decompressor.unused_data
+                member_end = fed - len(data)
+                self.members.append((member_start, member_end - member_start, member_starts_line))
+                member_start = member_end
+                member_starts_line = self._at_line_start
+                decompressor = zlib.decompressobj(31)
+                if data.lstrip(b"\x00") == b"":
+                    break  # Trailing padding
+    
+    def read_member(self, f, member_idx):
+        """Decompress one member from an open binary file"""
+        offset, length, _ = self.members[member_idx]
+        f.seek(offset)
+        return zlib.decompress(f.read(length), 31)
@@ -0,0 +1,346 @@
+"""
+Bounded-memory loaders that sample rows from data files, dispatched by format
+"""
+
+import csv
+import mmap
+import os
+import random
+from contextlib import closing
+from functools import partial
+from itertools import chain, islice
+
+from .formats import FORMATS
+from .formatting import TableFormatter
+from .gzindex import GzipMemberIndex
+from .parallel import ParallelSampler
+from .sampling import sample_group_rows
+from .table import ColumnarTable
+
+class DatasetLoader:
+    """Loads a header plus a uniform random sample of at most max_rows data rows
+    
+    Samples are returned as a ColumnarTable (or [] for a file without a header).
+    """
+    
+    MAX_DISPLAY_ROWS = 10000
+    MAX_CELL_CHARS = TableFormatter.MAX_COL_WIDTH + 1  # Enough to tell when a cell needs "..."
+    MMAP_MIN_BYTES = 64 * 1024 * 1024  # Smaller CSV files are streamed for an exact sample
+    MMAP_ATTEMPTS_PER_ROW = 16  # Random offsets tried per wanted row before giving up
+    GZIP_INDEX_MIN_BYTES = 16 * 1024 * 1024  # Smaller .csv.gz files are streamed
+    GZIP_WINDOW_OVERSAMPLE = 2  # Lines gathered from random members per wanted row
+    PARALLEL_MIN_BYTES = 256 * 1024 * 1024  # Smaller files load faster than a pool starts
+    
+    def __init__(self, max_rows=None, workers=1, formats=None):
+        self.max_rows = self.MAX_DISPLAY_ROWS if max_rows is None else max_rows
+        self.workers = workers  # Worker processes for large files; 1 loads in-process
+        self.formats = formats or FORMATS  # FormatRegistry picking the reader for each file
+        self.rows_seen = 0  # Data rows in the last file read, before sampling
+    
+    def limit_dataset_rows(self, dataset, max_rows=None):
+        """Limit dataset to header + max_rows randomly selected data rows"""
+        max_rows = self.max_rows if max_rows is None else max_rows
+        if len(dataset) > 1:
+            header = [dataset[0]]
+            data_rows = dataset[1:]
+            data_rows = self.sample_rows(data_rows, max_rows)
+            return header + data_rows
+        return dataset
+    
+    def sample_rows(self, rows, max_rows=None):
+        """Return up to max_rows sampled rows"""
+        max_rows = self.max_rows if max_rows is None else max_rows
+        if max_rows <= 0:
+            return []
+        if len(rows) > max_rows:
+            return random.sample(rows, max_rows)
+        return rows
+    
+    def new_table(self, header):
+        """Empty columnar table for the sampled rows of a file"""
+        return ColumnarTable(header, self.MAX_CELL_CHARS)
+    
+    def reservoir_sample(self, rows, max_rows=None, keep=None):
+        """Uniformly sample up to max_rows from an iterable in a single pass
+        
+        keep, if given, converts a row when it enters the sample, so only
+        the few rows that are kept pay for it.
+        """
+        max_rows = self.max_rows if max_rows is None else max_rows
+        sampled_rows = []
+        if max_rows <= 0:
+            return sampled_rows
+        
+        total_rows_seen = 0
+        for row in rows:
+            total_rows_seen += 1
+            if len(sampled_rows) < max_rows:
+                sampled_rows.append(keep(row) if keep else row)
+            else:
+                # Reservoir sampling: uniform replacement in existing sample
+                swap_index = random.randint(0, total_rows_seen - 1)
+                if swap_index < max_rows:
+                    sampled_rows[swap_index] = keep(row) if keep else row
+        self.rows_seen = total_rows_seen
+        return sampled_rows
+    
+    def load_rows_in_stream(self, rows, max_rows=None):
+        """Read header + sampled rows from an iterable of rows (header first) without materializing it"""
+        rows = iter(rows)
+        header = next(rows, None)
+        if header is None:
+            return []
+        
+        # Sampled rows wait as one packed bytes object each instead of a list of strings
+        dataset = self.new_table(header)
+        pack_row = partial(ColumnarTable.pack_row, max_cell_chars=self.MAX_CELL_CHARS)
+        for packed in self.reservoir_sample(rows, max_rows, keep=pack_row):
+            dataset.append_packed(packed)
+        return dataset
+    
+    def load_parquet_in_chunks(self, data_file, max_rows=None, selection=None, cell_text=None):
+        """Load sampled parquet rows, reading only the row groups and columns that contain them
+        
+        selection (a DatasetSelection) narrows the columns read and keeps only
+        rows matching its filters; row groups are pruned by their statistics.
+        cell_text turns values into display text (str() if not given).
+        """
+        max_rows = self.max_rows if max_rows is None else max_rows
+        
+        # Imported here so pyarrow is only loaded when a parquet file is picked
+        import pyarrow.parquet as pq
+        
+        try:
+            with closing(pq.ParquetFile(data_file)) as parquet_file:
+                names = parquet_file.schema_arrow.names
+                columns = selection.project(names) if selection else names
+                filters = selection.applicable_filters(names) if selection else []
+                
+                dataset = self.new_table(columns)
+                if max_rows <= 0:
+                    return dataset
+                
+                metadata = parquet_file.metadata
+                if filters:
+                    # Row indices of the matches, found by decoding only the filter columns
+                    candidates = self.matching_parquet_rows(parquet_file, selection, filters)
+                else:
+                    # Every row is a candidate, known from the row counts in the file metadata
+                    candidates = [
+                        (group_idx, None, metadata.row_group(group_idx).num_rows)
+                        for group_idx in range(metadata.num_row_groups)
+                    ]
+                
+                # Pick candidate positions up front
+                counts = [count for _, _, count in candidates]
+                self.rows_seen = sum(counts)
+                
+                # Read each row group holding selected rows, then convert them in bulk
+                for candidate_idx, positions in sample_group_rows(counts, max_rows):
+                    group_idx, group_rows, _ = candidates[candidate_idx]
+                    local_indices = positions if group_rows is None else [group_rows[p] for p in positions]
+                    table = parquet_file.read_row_group(group_idx, columns=columns)
+                    if len(local_indices) < table.num_rows:
+                        table = table.take(local_indices)
+                    dataset.append_columns([column.to_pylist() for column in table.columns], cell_text)
+        except Exception as e:
+            raise RuntimeError(f"Failed to stream parquet file {data_file}: {e}") from e
+        
+        return dataset
+    
+    def matching_parquet_rows(self, parquet_file, selection, filters):
+        """(row group, matching local row indices, match count) for groups with matches"""
+        import pyarrow.compute as pc
+        
+        filter_columns = list(dict.fromkeys(column for column, _, _ in filters))
+        metadata = parquet_file.metadata
+        candidates = []
+        for group_idx in range(metadata.num_row_groups):
+            if not selection.row_group_may_match(metadata.row_group(group_idx), filters):
+                continue  # Statistics prove no row can match, skip decoding entirely
+            table = parquet_file.read_row_group(group_idx, columns=filter_columns)
+            group_rows = pc.indices_nonzero(selection.filter_mask(table, filters)).to_pylist()
+            if group_rows:
+                candidates.append((group_idx, group_rows, len(group_rows)))
+        return candidates
+    
+    def load_csv_mmap(self, data_file, max_rows=None):
+        """Sample rows of an uncompressed CSV at random byte offsets, decoding only those lines
+        
+        A random offset lands in a line with probability proportional to its
+        length, so each hit is kept with probability shortest/length to make
+        every line equally likely. Returns None when the file needs the
+        streaming reader instead: quoted fields spanning lines, line lengths
+        too uneven to sample by offset, or fewer lines than max_rows.
+        """
+        max_rows = self.max_rows if max_rows is None else max_rows
+        
+        with open(data_file, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                header_end = mm.find(b'\n')
+                header_end = size - 1 if header_end < 0 else header_end
+                header_bytes = mm[:header_end + 1]
+                if header_bytes.count(b'"') % 2:
+                    return None
+                header = next(csv.reader([header_bytes.decode('utf-8')]), [])
+                
+                dataset = self.new_table(header)
+                data_start = header_end + 1
+                if data_start >= size or max_rows <= 0:
+                    return dataset
+                
+                line_at = partial(self.csv_line_at, mm, data_start)
+                draws = max_rows * self.MMAP_ATTEMPTS_PER_ROW
+                hits = (line_at(random.randrange(data_start, size)) for _ in range(draws))
+                
+                # The shortest line among the first hits sets the acceptance scale
+                first_hits = list(islice(hits, max_rows))
+                shortest = min(length for _, length in first_hits)
+                
+                line_starts = set()
+                inverse_lengths = 0.0
+                hit_count = 0
+                for start, length in chain(first_hits, hits):
+                    hit_count += 1
+                    inverse_lengths += 1 / length
+                    if random.random() * length < shortest:
+                        line_starts.add(start)
+                        if len(line_starts) == max_rows:
+                            break
+                else:
+                    return None
+                
+                # Decode the chosen lines in file order so page reads stay sequential
+                for start in sorted(line_starts):
+                    end = mm.find(b'\n', start)
+                    end = size if end < 0 else end + 1
+                    line_bytes = mm[start:end]
+                    if line_bytes.count(b'"') % 2:
+                        return None  # Quoted newline, line boundaries are not record boundaries
+                    row = next(csv.reader([line_bytes.decode('utf-8')]), [])
+                    if len(row) != len(header):
+                        return None  # Likely the middle of a quoted field spanning lines
+                    dataset.append(row)
+        
+        # The mean of 1/length over uniform offsets is the number of lines per byte
+        self.rows_seen = round((size - data_start) * inverse_lengths / hit_count)
+        return dataset
+    
+    @staticmethod
+    def csv_line_at(mm, data_start, offset):
+        """(start, length) of the line of a memory-mapped CSV holding a byte offset"""
+        start = mm.rfind(b'\n', data_start, offset) + 1 or data_start
+        end = mm.find(b'\n', offset)
+        return start, (len(mm) if end < 0 else end + 1) - start
+    
+    def load_csv_gz_indexed(self, data_file, max_rows=None):
+        """Sample rows of a multi-member (e.g. BGZF) .csv.gz by inflating a few random members
+        
+        Returns None when the file needs the streaming reader instead: a
+        single gzip member (no seek points) or quoted fields spanning lines.
+        """
+        max_rows = self.max_rows if max_rows is None else max_rows
+        
+        index = GzipMemberIndex(data_file)
+        members = index.load_or_build()
+        if len(members) < 2:
+            return None
+        
+        with open(data_file, 'rb') as f:
+            first_window = index.read_member(f, 0)
+            header_bytes = first_window.split(b'\n', 1)[0]
+            if header_bytes.count(b'"') % 2:
+                return None
+            header = next(csv.reader([header_bytes.decode('utf-8')]), [])
+            dataset = self.new_table(header)
+            if max_rows <= 0:
+                return dataset
+            
+            # Gather whole lines from random members until there are enough to sample from
+            candidate_lines = []
+            members_read = 0
+            for member_idx in random.sample(range(len(members)), len(members)):
+                if len(candidate_lines) >= max_rows * self.GZIP_WINDOW_OVERSAMPLE:
+                    break
+                window = first_window if member_idx == 0 else index.read_member(f, member_idx)
+                members_read += 1
+                
+                # Complete the last line from the members that follow
+                next_idx = member_idx + 1
+                while not window.endswith(b'\n') and next_idx < len(members):
+                    following = index.read_member(f, next_idx)
+                    cut = following.find(b'\n')
+                    if cut >= 0:
+                        window += following[:cut + 1]
+                        break
+                    window += following
+                    next_idx += 1
+                
+                # The first piece is the header in member 0, and the end of an earlier line
+                # unless the member starts on a line boundary
+                lines = window.split(b'\n')
+                if member_idx == 0 or not members[member_idx][2]:
+                    lines.pop(0)
+                if lines and lines[-1] == b'':
+                    lines.pop()
+                for line in lines:
+                    if line.count(b'"') % 2:
+                        return None  # Quoted newline, line boundaries are not record boundaries
+                candidate_lines.extend(lines)
+        
+        # Estimate the row count from the lines per member seen so far
+        self.rows_seen = len(candidate_lines) * len(members) // max(members_read, 1)
+        if len(candidate_lines) > max_rows:
+            candidate_lines = random.sample(candidate_lines, max_rows)
+        for line in candidate_lines:
+            dataset.append(next(csv.reader([line.decode('utf-8')]), []))
+        return dataset
+    
+    def parallel_sampler(self):
+        """Sampler splitting one large file across this loader's worker processes"""
+        return ParallelSampler(self.workers, self.MAX_CELL_CHARS)
+    
+    def load_file(self, data_file, selection=None):
+        """Load header + sampled rows from a data file, read by the format its name ends in
+        
+        Suffixes are matched case-insensitively; files no format claims are
+        read as CSV. selection (a DatasetSelection) applies to formats that
+        support it: Parquet, Arrow and SQLite.
+        """
+        data_format = self.formats.find(data_file) or self.formats.get("csv")
+        
+        # Multi-GB files are split across worker processes when more than one is allowed
+        if self.workers != 1 and os.path.getsize(data_file) >= self.PARALLEL_MIN_BYTES:
+            dataset = data_format.load_parallel(self, data_file, selection)
+            if dataset is not None:
+                return dataset
+        
+        return data_format.load(self, data_file, selection)
+    
+    def create_sample_csv(self, csv_folder):
+        """Create sample CSV files for demonstration"""
+        # Sample 1: Classic data
+        sample1_path = os.path.join(csv_folder, "retro_computers.csv")
+        with open(sample1_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Computer", "Year", "CPU", "RAM"])
+            writer.writerow(["Commodore 64", "1982", "MOS 6510", "64 KB"])
+            writer.writerow(["Apple II", "1977", "MOS 6502", "4 KB"])
+            writer.writerow(["IBM PC", "1981", "Intel 8088", "16 KB"])
+            writer.writerow(["Atari 800", "1979", "MOS 6502", "8 KB"])
+            writer.writerow(["ZX Spectrum", "1982", "Zilog Z80", "16 KB"])
+            writer.writerow(["Amiga 500", "1987", "Motorola 68000", "512 KB"])
+        
+        # Sample 2: Fun facts
+        sample2_path = os.path.join(csv_folder, "fun_facts.csv")
+        with open(sample2_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Fact ID", "Category", "Fact"])
+            writer.writerow(["001", "Space", "A day on Venus is longer than its year"])
+            writer.writerow(["002", "Ocean", "More people have been to space than the Mariana Trench"])
+            writer.writerow(["003", "Nature", "Honey never spoils - it can last thousands of years"])
+            writer.writerow(["004", "Tech", "The first computer bug was an actual moth"])
+            writer.writerow(["005", "History", "Oxford University predates the Aztec Empire"])
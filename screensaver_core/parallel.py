@@ -0,0 +1,176 @@
+"""
+Process-pool sampling: large Parquet files are split by row group and CSV
+files by byte range, each partition is sampled in a worker process and the
+per-partition samples are merged into one uniform sample
+"""
+
+import csv
+import os
+import random
+
+from .sampling import sample_group_rows
+from .table import ColumnarTable
+
+def sample_csv_range(data_file, start, end, max_rows, max_cell_chars=None):
+    """Reservoir-sample the lines starting in [start, end) of a CSV file
+    
+    Returns (lines_seen, packed sampled rows), or None if a line has an odd
+    number of quotes, since then byte ranges may split quoted records.
+    """
+    sampled_lines = []
+    lines_seen = 0
+    with open(data_file, 'rb') as f:
+        # Skip the line that straddles the start, it belongs to the previous range
+        f.seek(start - 1)
+        pos = start - 1 + len(f.readline())
+        
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            if line.count(b'"') % 2:
+                return None
+            lines_seen += 1
+            if len(sampled_lines) < max_rows:
+                sampled_lines.append(line)
+            else:
+                swap_index = random.randint(0, lines_seen - 1)
+                if swap_index < max_rows:
+                    sampled_lines[swap_index] = line
+    
+    # Only the sampled lines are decoded and parsed, then packed for the trip back
+    return lines_seen, [
+        ColumnarTable.pack_row(next(csv.reader([line.decode('utf-8')]), []), max_cell_chars)
+        for line in sampled_lines
+    ]
+
+def read_parquet_groups(data_file, columns, group_indices):
+    """Read the given (row group, local row indices) pairs of a parquet file as lists of column values"""
+    import pyarrow.parquet as pq
+    
+    group_columns = []
+    parquet_file = pq.ParquetFile(data_file)
+    try:
+        for group_idx, local_indices in group_indices:
+            table = parquet_file.read_row_group(group_idx, columns=columns)
+            if len(local_indices) < table.num_rows:
+                table = table.take(local_indices)
+            group_columns.append([column.to_pylist() for column in table.columns])
+    finally:
+        parquet_file.close()
+    return group_columns
+
+class ParallelSampler:
+    """Samples one large file across a pool of worker processes"""
+    
+    PARTITIONS_PER_WORKER = 2  # Smaller partitions even out slow workers
+    
+    def __init__(self, workers=None, max_cell_chars=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_cell_chars = max_cell_chars  # Cell length kept in the sampled table
+    
+    def make_pool(self):
+        """Start a pool without forking the (threaded, GTK) parent process"""
+        # Imported here so activations that never start a pool skip their import time
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        
+        methods = multiprocessing.get_all_start_methods()
+        method = "forkserver" if "forkserver" in methods else "spawn"
+        return ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context(method))
+    
+    def merge_samples(self, partitions, max_rows):
+        """Merge (population, sample) pairs into one uniform sample of at most max_rows
+        
+        Draws how many rows each partition contributes from the multivariate
+        hypergeometric distribution over the partition populations, so every
+        row of the file is equally likely regardless of how it was split.
+        """
+        remaining = [population for population, _ in partitions]
+        total = sum(remaining)
+        wanted = min(max_rows, total)
+        taken = [0] * len(partitions)
+        for _ in range(wanted):
+            pick = random.randrange(total)
+            for idx, population in enumerate(remaining):
+                if pick < population:
+                    break
+                pick -= population
+            taken[idx] += 1
+            remaining[idx] -= 1
+            total -= 1
+        
+        merged = []
+        for (_, sample), count in zip(partitions, taken):
+            merged.extend(random.sample(sample, count))
+        random.shuffle(merged)
+        return merged
+    
+    def sample_csv(self, data_file, max_rows):
+        """Sample a plain CSV by byte range; returns (rows_seen, dataset) or None to fall back"""
+        with open(data_file, 'rb') as f:
+            header_line = f.readline()
+            data_start = f.tell()
+            size = os.fstat(f.fileno()).st_size
+        if not header_line or header_line.count(b'"') % 2:
+            return None
+        dataset = ColumnarTable(next(csv.reader([header_line.decode('utf-8')]), []),
+                                self.max_cell_chars)
+        if max_rows <= 0 or data_start >= size:
+            return 0, dataset
+        
+        partition_count = self.workers * self.PARTITIONS_PER_WORKER
+        step = max(1, (size - data_start) // partition_count)
+        bounds = list(range(data_start, size, step)) + [size]
+        with self.make_pool() as pool:
+            futures = [
+                pool.submit(sample_csv_range, data_file, start, end, max_rows, self.max_cell_chars)
+                for start, end in zip(bounds, bounds[1:])
+            ]
+            partitions = [future.result() for future in futures]
+        if any(partition is None for partition in partitions):
+            return None
+        
+        rows_seen = sum(population for population, _ in partitions)
+        for packed in self.merge_samples(partitions, max_rows):
+            dataset.append_packed(packed)
+        return rows_seen, dataset
+    
+    def sample_parquet(self, data_file, max_rows, selection=None, cell_text=None):
+        """Sample a parquet file with its row groups read across workers; returns (rows_seen, dataset)
+        
+        cell_text turns values into display text (str() if not given).
+        """
+        import pyarrow.parquet as pq
+        
+        parquet_file = pq.ParquetFile(data_file)
+        try:
+            columns = parquet_file.schema_arrow.names
+            if selection:
+                columns = selection.project(columns)
+            metadata = parquet_file.metadata
+        finally:
+            parquet_file.close()
+        total_rows = metadata.num_rows
+        dataset = ColumnarTable(columns, self.max_cell_chars)
+        if max_rows <= 0:
+            return total_rows, dataset
+        
+        # Row indices are picked from metadata, so partitions need no merging weights
+        group_indices = sample_group_rows(
+            [metadata.row_group(group_idx).num_rows for group_idx in range(metadata.num_row_groups)],
+            max_rows,
+        )
+        
+        # Deal the needed row groups out round-robin, one task per worker
+        shares = [group_indices[idx::self.workers] for idx in range(self.workers)]
+        with self.make_pool() as pool:
+            futures = [
+                pool.submit(read_parquet_groups, data_file, columns, share)
+                for share in shares if share
+            ]
+            for future in futures:
+                for group_columns in future.result():
+                    dataset.append_columns(group_columns, cell_text)
+        return total_rows, dataset
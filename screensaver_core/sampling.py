@@ -0,0 +1,29 @@
+"""
+Uniform sampling of rows spread over groups, e.g. Parquet row groups or Arrow record batches
+"""
+
+import random
+from bisect import bisect_left
+
+def sample_group_rows(counts, max_rows):
+    """Pick up to max_rows of all rows uniformly, given the row count of each group
+    
+    Returns (group position, sorted local row positions) pairs in group
+    order, for the groups holding picked rows only, so groups without any
+    are never read.
+    """
+    total_rows = sum(counts)
+    selected = sorted(random.sample(range(total_rows), max(0, min(max_rows, total_rows))))
+    
+    picks = []
+    group_start = 0
+    for group_pos, count in enumerate(counts):
+        group_end = group_start + count
+        first = bisect_left(selected, group_start)
+        last = bisect_left(selected, group_end, first)
+        if last > first:
+            picks.append((group_pos, [row - group_start for row in selected[first:last]]))
+        if last == len(selected):
+            break
+        group_start = group_end
+    return picks
@@ -0,0 +1,125 @@
+"""
+Per-dataset column selection and row predicates, pushed down into Parquet reads
+"""
+
+import json
+import os
+
+class DatasetSelection:
+    """Columns to show and simple "column op value" row filters for a dataset
+    
+    Set for all files from the command line, or per file with a sidecar JSON
+    file next to it, e.g. sales.parquet.screensaver.json:
+        
+        {"columns": ["region", "total"], "filters": ["total > 1000", "region != 'test'"]}
+    """
+    
+    SIDECAR_SUFFIX = ".screensaver.json"
+    OPERATORS = ("==", "!=", "<=", ">=", "<", ">")  # Two-character operators are matched first
+    
+    def __init__(self, columns=None, filters=None):
+        self.columns = list(columns) if columns else None  # None shows every column
+        self.filters = [self.parse_filter(f) for f in filters or []]  # (column, op, value)
+    
+    @staticmethod
+    def parse_columns(text):
+        """Names in a comma-separated column list, ignoring spaces around them"""
+        return [name.strip() for name in text.split(",") if name.strip()]
+    
+    @classmethod
+    def parse_filter(cls, expression):
+        """Turn "total > 1000" (or a [column, op, value] list) into a (column, op, value) tuple"""
+        if not isinstance(expression, str):
+            column, op, value = expression
+            if op not in cls.OPERATORS:
+                raise ValueError(f"Unknown filter operator {op!r} in {expression!r}")
+            return column, op, value
+        
+        for op in cls.OPERATORS:
+            column, found, value_text = expression.partition(op)
+            if found:
+                break
+        else:
+            raise ValueError(f"Filter {expression!r} needs one of: {' '.join(cls.OPERATORS)}")
+        
+        # Numbers, true/false and "quoted" strings parse as JSON; anything else is a bare string
+        value_text = value_text.strip()
+        if value_text[:1] == "'" and value_text[-1:] == "'":
+            value = value_text[1:-1]
+        else:
+            try:
+                value = json.loads(value_text)
+            except ValueError:
+                value = value_text
+        return column.strip(), op, value
+    
+    @classmethod
+    def for_file(cls, data_file, default=None):
+        """The sidecar selection for data_file if it has one, otherwise default"""
+        sidecar_path = f"{data_file}{cls.SIDECAR_SUFFIX}"
+        if not os.path.exists(sidecar_path):
+            return default
+        with open(sidecar_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        return cls(config.get("columns"), config.get("filters"))
+    
+    def cache_key(self):
+        """Stable description used to keep cached samples of different selections apart"""
+        return json.dumps([self.columns, self.filters], default=str)
+    
+    def project(self, names):
+        """Selected columns present in a file, or all of its columns if none are"""
+        if not self.columns:
+            return list(names)
+        present = set(names)
+        return [name for name in self.columns if name in present] or list(names)
+    
+    def applicable_filters(self, names):
+        """Filters whose column exists in a file; the others cannot be evaluated and are skipped"""
+        present = set(names)
+        return [f for f in self.filters if f[0] in present]
+    
+    def row_group_may_match(self, row_group, filters):
+        """False if a row group's min/max statistics rule out every filter match"""
+        stats_by_name = {}
+        for idx in range(row_group.num_columns):
+            column = row_group.column(idx)
+            stats_by_name[column.path_in_schema] = column.statistics
+        
+        for column_name, op, value in filters:
+            stats = stats_by_name.get(column_name)
+            if stats is None or not stats.has_min_max:
+                continue
+            try:
+                low, high = stats.min, stats.max
+                if op == "==" and not low <= value <= high:
+                    return False
+                if op == "!=" and low == high == value:
+                    return False
+                if (op == "<" and not low < value) or (op == "<=" and not low <= value):
+                    return False
+                if (op == ">" and not high > value) or (op == ">=" and not high >= value):
+                    return False
+            except TypeError:
+                continue  # Statistics of another type (e.g. dates); read the group to be safe
+        return True
+    
+    def filter_mask(self, table, filters):
+        """Boolean array of the table rows matching every filter (nulls never match)"""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        
+        compare = {
+            "==": pc.equal, "!=": pc.not_equal, "<": pc.less,
+            "<=": pc.less_equal, ">": pc.greater, ">=": pc.greater_equal,
+        }
+        mask = None
+        for column_name, op, value in filters:
+            column = table.column(column_name)
+            try:
+                scalar = pa.scalar(value).cast(column.type)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+                raise ValueError(f"Filter value {value!r} does not fit column {column_name!r}: {e}") from e
+            matches = pc.fill_null(compare[op](column, scalar), False)
+            mask = matches if mask is None else pc.and_(mask, matches)
+        return mask
@@ -0,0 +1,84 @@
+"""
+Data source: picks a data file, then loads, samples, caches and formats it
+"""
+
+import os
+import threading
+
+from .cache import DataFileIndex, DatasetCache
+from .formatting import TableFormatter
+from .loaders import DatasetLoader
+from .selection import DatasetSelection
+
+DEFAULT_DATA_FOLDER = os.path.expanduser("~/.local/share/csv-screensaver/data")
+
+class DataSource:
+    """Everything between a data folder and the formatted table lines of one dataset"""
+    
+    PLAYLIST_MODES = ("random", "shuffle", "weighted")
+    
+    def __init__(self, data_folder=None, max_rows=None, use_cache=True, workers=1, selection=None):
+        self.data_folder = data_folder or DEFAULT_DATA_FOLDER
+        self.selection = selection  # Default DatasetSelection for files without a sidecar
+        self.loader = DatasetLoader(max_rows, workers)
+        self.formatter = TableFormatter()
+        self.dataset_cache = DatasetCache() if use_cache else None
+        self.file_index = DataFileIndex(self.data_folder)
+        self.current_dataset = []
+        self.last_file = None  # Path of the most recently picked file
+        self.lock = threading.Lock()  # Loader threads take turns
+    
+    def load_lines(self, mode="random"):
+        """Load a data file of any registered format from the data folder
+        
+        Returns an iterable of formatted lines to display between the banner and the footer.
+        Safe to call from worker threads; the returned lines are produced lazily.
+        """
+        with self.lock:
+            return self._load_lines(mode)
+    
+    def _load_lines(self, mode):
+        if not os.path.exists(self.data_folder):
+            # Create folder and add sample data
+            os.makedirs(self.data_folder, exist_ok=True)
+            self.loader.create_sample_csv(self.data_folder)
+        
+        # Find data files of every registered format (including subfolders) via the index
+        try:
+            self.file_index.refresh()
+        except OSError as e:
+            return [f"Error reading data folder {self.data_folder}: {e}"]
+        
+        # Pick a random file
+        data_file = self.file_index.choose(mode)
+        self.last_file = data_file
+        if data_file is None:
+            return ["No data files found in: " + self.data_folder]
+        
+        try:
+            selection = DatasetSelection.for_file(data_file, self.selection)
+        except (OSError, ValueError) as e:
+            return [f"Error reading selection for {data_file.name}: {e}"]
+        variant = selection.cache_key() if selection else None
+        
+        try:
+            # Repeat activations reuse the previously sampled rows and widths
+            cached = self.dataset_cache.load(data_file, variant) if self.dataset_cache else None
+            if cached is not None:
+                self.current_dataset, col_widths = cached
+                return self.formatter.prepare_display_text(self.current_dataset, col_widths)
+            
+            self.current_dataset = self.loader.load_file(data_file, selection)
+            
+            if self.current_dataset:
+                lines = self.formatter.prepare_display_text(self.current_dataset)
+                if selection is None or not selection.filters:
+                    self.file_index.record_rows(data_file, self.loader.rows_seen)
+                if self.dataset_cache:
+                    self.dataset_cache.store(data_file, self.current_dataset, self.formatter.col_widths,
+                                             variant)
+                return lines
+            else:
+                return [f"Empty file: {data_file.name}"]
+        except Exception as e:
+            return [f"Error loading file: {str(e)}"]
@@ -0,0 +1,98 @@
+"""
+Opt-in performance instrumentation shared by the screensaver front-ends
+"""
+
+import json
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+class PerfStats:
+    """Opt-in timing histograms, missed frame counts and memory usage"""
+    
+    # Upper bounds of the duration histogram buckets in milliseconds
+    BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, 133, float("inf"))
+    
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.timings = {}  # Name -> {"count", "total_ms", "max_ms", "histogram"}
+        self.missed_frames = 0
+        self.started = time.monotonic()
+        self.lock = threading.Lock()  # Loader threads record timings too
+    
+    def timed(self, name):
+        """Context manager recording the duration of the block under name"""
+        if not self.enabled:
+            return nullcontext()
+        return self._timed(name)
+    
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+    
+    def record(self, name, duration_ms):
+        """Add one duration sample"""
+        with self.lock:
+            stats = self.timings.get(name)
+            if stats is None:
+                stats = {"count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                         "histogram": [0] * len(self.BUCKETS_MS)}
+                self.timings[name] = stats
+            stats["count"] += 1
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+            for bucket, upper in enumerate(self.BUCKETS_MS):
+                if duration_ms <= upper:
+                    stats["histogram"][bucket] += 1
+                    break
+    
+    def record_frame_interval(self, interval_ms, expected_ms):
+        """Count the frames skipped when a timer fired late"""
+        if self.enabled and interval_ms > expected_ms * 1.5:
+            self.missed_frames += int(interval_ms / expected_ms) - 1
+    
+    def rss_kb(self):
+        """Current resident set size, falling back to the peak where /proc is missing"""
+        try:
+            with open("/proc/self/statm", "r") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+        except (OSError, ValueError, IndexError):
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    
+    def summary_line(self):
+        """One-line text for the on-screen HUD"""
+        parts = []
+        with self.lock:
+            for name, stats in sorted(self.timings.items()):
+                average = stats["total_ms"] / stats["count"]
+                parts.append(f"{name} {average:.2f}/{stats['max_ms']:.1f}ms")
+        parts.append(f"missed {self.missed_frames}")
+        parts.append(f"rss {self.rss_kb() // 1024}MB")
+        return " | ".join(parts)
+    
+    def to_dict(self):
+        """All recorded statistics as JSON-serializable data"""
+        with self.lock:
+            timings = {
+                name: dict(stats, mean_ms=stats["total_ms"] / stats["count"])
+                for name, stats in self.timings.items()
+            }
+        return {
+            "uptime_s": time.monotonic() - self.started,
+            "bucket_upper_bounds_ms": [str(upper) for upper in self.BUCKETS_MS],
+            "timings": timings,
+            "missed_frames": self.missed_frames,
+            "rss_kb": self.rss_kb(),
+            "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+    
+    def dump(self, path):
+        """Write the statistics to a JSON file"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,180 @@
+"""
+Compact columnar storage for sampled rows
+"""
+
+from array import array
+from itertools import accumulate
+
+class ColumnarTable:
+    """Header plus rows stored column by column as UTF-8 string pools with offsets
+    
+    Indexes and iterates like the [header] + rows lists it replaces: item 0
+    is the header. Indexing returns RowView objects whose cells are decoded
+    on access; iteration decodes a block of rows at a time and yields tuples
+    of strings. With clipped cells, a cell costs its UTF-8 bytes plus a
+    one-byte length instead of a Python string object and a list slot.
+    """
+    
+    FIELD_SEPARATOR = "\x1f"  # ASCII unit separator between the cells of a packed row
+    ROW_BLOCK = 64  # Rows per stored pool position; positions inside a block add up lengths
+    
+    def __init__(self, header, max_cell_chars=None):
+        self.header = [str(cell) for cell in header]
+        self.max_cell_chars = max_cell_chars  # Longer cells are cut, they are never shown in full
+        
+        # Clipped cells are at most 4 bytes per character, short enough for one-byte lengths
+        length_type = "B" if max_cell_chars is not None and max_cell_chars * 4 <= 255 else "I"
+        self.data = [bytearray() for _ in self.header]  # One UTF-8 pool per column
+        self.lengths = [array(length_type) for _ in self.header]  # Encoded length of every cell
+        self.block_starts = [array("I") for _ in self.header]  # Pool position of each block's first cell
+        self.num_rows = 0
+    
+    @classmethod
+    def from_rows(cls, rows, max_cell_chars=None):
+        """Build a table from a [header] + rows list"""
+        rows = iter(rows)
+        table = cls(next(rows, []), max_cell_chars)
+        for row in rows:
+            table.append(row)
+        return table
+    
+    @staticmethod
+    def clip_cell(cell, max_cell_chars=None):
+        """Display text of a cell value, cut to max_cell_chars"""
+        text = str(cell)
+        if max_cell_chars is not None and len(text) > max_cell_chars:
+            return text[:max_cell_chars]
+        return text
+    
+    @classmethod
+    def pack_row(cls, row, max_cell_chars=None):
+        """One bytes object per row: a compact form for rows waiting in a sampler"""
+        return cls.FIELD_SEPARATOR.join(
+            cls.clip_cell(cell, max_cell_chars).replace(cls.FIELD_SEPARATOR, " ") for cell in row
+        ).encode("utf-8")
+    
+    def append(self, row):
+        """Add one row of cell values; missing cells are empty, extra cells are dropped"""
+        if not row:
+            return  # Blank lines are never displayed
+        new_block = self.num_rows % self.ROW_BLOCK == 0
+        for col_idx, pool in enumerate(self.data):
+            text = self.clip_cell(row[col_idx], self.max_cell_chars) if col_idx < len(row) else ""
+            encoded = text.encode("utf-8")
+            if new_block:
+                self.block_starts[col_idx].append(len(pool))
+            pool += encoded
+            self.lengths[col_idx].append(len(encoded))
+        self.num_rows += 1
+    
+    def append_packed(self, packed):
+        """Add a row made by pack_row"""
+        if packed:
+            self.append(packed.decode("utf-8").split(self.FIELD_SEPARATOR))
+    
+    def append_columns(self, columns, cell_text=None):
+        """Add rows given column by column, e.g. the to_pylist() of each pyarrow column
+        
+        cell_text turns each value into its display text (str() if not given).
+        """
+        if not columns:
+            return
+        cell_text = cell_text or str
+        for values, pool, lengths, block_starts in zip(columns, self.data, self.lengths,
+                                                      self.block_starts):
+            for row_idx, value in enumerate(values, self.num_rows):
+                encoded = self.clip_cell(cell_text(value), self.max_cell_chars).encode("utf-8")
+                if row_idx % self.ROW_BLOCK == 0:
+                    block_starts.append(len(pool))
+                pool += encoded
+                lengths.append(len(encoded))
+        self.num_rows += len(columns[0])
+    
+    def cell(self, row_idx, col_idx):
+        """Text of one data cell"""
+        lengths = self.lengths[col_idx]
+        block_row = row_idx - row_idx % self.ROW_BLOCK
+        start = self.block_starts[col_idx][block_row // self.ROW_BLOCK] + sum(lengths[block_row:row_idx])
+        return self.data[col_idx][start:start + lengths[row_idx]].decode("utf-8")
+    
+    def column_widths(self):
+        """Length in characters of the longest text in each column, header included"""
+        widths = []
+        for name, pool, lengths in zip(self.header, self.data, self.lengths):
+            width = max(lengths, default=0)
+            if not pool.isascii():
+                # Multi-byte characters: only cells with more bytes than the widest so far can be wider
+                width = 0
+                for end, length in zip(accumulate(lengths), lengths):
+                    if length > width:
+                        width = max(width, len(pool[end - length:end].decode("utf-8")))
+                        if width == self.max_cell_chars:
+                            break  # Cells are clipped, none is longer
+            widths.append(max(len(name), width))
+        return widths
+    
+    def nbytes(self):
+        """Bytes held by the cell pools, lengths and block positions"""
+        return sum(
+            len(pool) + lengths.itemsize * len(lengths) + block_starts.itemsize * len(block_starts)
+            for pool, lengths, block_starts in zip(self.data, self.lengths, self.block_starts)
+        )
+    
+    def __len__(self):
+        return self.num_rows + 1  # Header included, like the lists it replaces
+    
+    def __iter__(self):
+        yield self.header
+        for block_row in range(0, self.num_rows, self.ROW_BLOCK):
+            block_end = min(block_row + self.ROW_BLOCK, self.num_rows)
+            block_columns = []
+            for pool, lengths, block_starts in zip(self.data, self.lengths, self.block_starts):
+                ends = list(accumulate(lengths[block_row:block_end]))
+                block_start = block_starts[block_row // self.ROW_BLOCK]
+                text = pool[block_start:block_start + ends[-1]].decode("utf-8")
+                if len(text) == ends[-1]:
+                    # ASCII only: byte offsets are character offsets, slice the decoded block
+                    block_columns.append([text[start:end] for start, end in zip([0] + ends, ends)])
+                else:
+                    block_columns.append([
+                        pool[block_start + start:block_start + end].decode("utf-8")
+                        for start, end in zip([0] + ends, ends)
+                    ])
+            yield from zip(*block_columns)
+    
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("table index out of range")
+        return self.header if idx == 0 else RowView(self, idx - 1)
+
+class RowView:
+    """One data row of a ColumnarTable, decoded cell by cell"""
+    
+    __slots__ = ("table", "row_idx")
+    
+    def __init__(self, table, row_idx):
+        self.table = table
+        self.row_idx = row_idx
+    
+    def __len__(self):
+        return len(self.table.header)
+    
+    def __iter__(self):
+        for col_idx in range(len(self.table.header)):
+            yield self.table.cell(self.row_idx, col_idx)
+    
+    def __getitem__(self, col_idx):
+        if isinstance(col_idx, slice):
+            return [self.table.cell(self.row_idx, i) for i in range(*col_idx.indices(len(self)))]
+        if col_idx < 0:
+            col_idx += len(self)
+        if not 0 <= col_idx < len(self):
+            raise IndexError("row index out of range")
+        return self.table.cell(self.row_idx, col_idx)
+    
+    def __repr__(self):
+        return f"RowView({list(self)!r})"
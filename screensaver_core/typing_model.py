@@ -0,0 +1,44 @@
+"""
+Typing speed model: starts slow and accelerates towards a minimum delay per character
+"""
+
+class TypingSpeedModel:
+    """Acceleration curve shared by the GTK and terminal typing animations (times in ms)"""
+    
+    MAX_CHARS_PER_FRAME = 400  # Bound per-frame work after stalls
+    
+    def __init__(self, initial_delay=150, min_delay=2, decrease_rate=0.98):
+        self.initial_delay = initial_delay  # Start with slow typing (milliseconds)
+        self.min_delay = min_delay  # End with fast typing (~500 chars/s)
+        self.decrease_rate = decrease_rate  # How fast the typing accelerates
+        self.reset()
+    
+    def reset(self):
+        """Go back to the slow initial speed"""
+        self.typing_delay = self.initial_delay
+        self.typing_budget = 0.0  # Milliseconds of typing time not yet spent
+    
+    def chars_due(self, elapsed_ms, available):
+        """Return how many of the available characters are due after elapsed_ms"""
+        self.typing_budget += elapsed_ms
+        limit = min(available, self.MAX_CHARS_PER_FRAME)
+        count = 0
+        
+        # Accelerating phase: every character shortens the delay of the next one
+        while (count < limit and self.typing_delay > self.min_delay
+               and self.typing_budget >= self.typing_delay):
+            self.typing_budget -= self.typing_delay
+            self.typing_delay *= self.decrease_rate
+            count += 1
+        
+        # Constant-speed phase: delay has bottomed out, so count the rest in one step
+        if count < limit and self.typing_delay <= self.min_delay:
+            steady = min(int(self.typing_budget // self.typing_delay), limit - count)
+            self.typing_budget -= steady * self.typing_delay
+            count += steady
+        
+        # Don't build up a backlog when the frame cap was hit (e.g. after a stall)
+        if count == limit:
+            self.typing_budget = min(self.typing_budget, self.typing_delay)
+        
+        return count
@@ -17,6 +17,12 @@ if [ -f /usr/bin/csv-screensaver ]; then
     rm /usr/bin/csv-screensaver
 fi
 
+# Remove the core library
+if [ -d /usr/lib/csv-screensaver ]; then
+    echo "Removing core library..."
+    rm -rf /usr/lib/csv-screensaver
+fi
+
 # Remove the desktop file
 if [ -f /usr/share/applications/csv-screensaver.desktop ]; then
     echo "Removing desktop entry..."